@@ -0,0 +1,570 @@
+#!/usr/bin/env python
+
+################################################################################
+#
+# X32 Benchmark
+#
+# Benchmarks for X32Snippets, on synthetic shows of any size, and live against the X32 emulator
+#
+# Free for non-commercial use
+#
+################################################################################
+
+VERSION = "1.0"
+
+################################################################################
+# Imports
+################################################################################
+
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+from xml.sax.saxutils import escape
+
+import X32Emulator
+import X32Snippets
+
+################################################################################
+# Constants
+################################################################################
+
+# the synthetic shows
+
+CUE_COUNTS                 = [ 1000, 10000 ] # show sizes to benchmark by default (or --cues=1000,50000)
+NUM_CHANS                  = 32    # channels, buses and aux ins in each show (or --chans, --buses, --auxins)
+NUM_BUSES                  = 16
+NUM_AUXINS                 = 8
+SPLIT_EVERY                = 250   # cues between SPLIT_MARKER rows
+RANDOM_SEED                = 32    # so every run benchmarks the same shows
+REPEATS                    = 3     # times each show is built, keeping the best time for each stage
+
+BASELINE_FILE              = 'X32Benchmark.json' # where --save-baseline keeps results to compare later runs with
+BASELINE_TOLERANCE         = 0.2   # fraction slower or bigger than the baseline to flag as a regression
+
+# reading
+
+READ_CHECK_CUES            = 100   # cues in the synthetic show --read-check writes in each format
+
+# startup
+
+STARTUP_RUNS               = 10    # times to start each command, taking the median
+STARTUP_LIMIT              = 0.1   # seconds X32Snippets.py may take to print its usage message
+
+# the emulated console for the live benchmark, which a GO of single messages will overrun
+
+LIVE_CONSOLE_RATE          = 3000  # packets per second the emulated console gets through
+LIVE_BUFFER_PACKETS        = 32    # packets its receive buffer holds
+LIVE_DROP_RATE             = 0.002 # chance of losing any packet on the way regardless
+LIVE_SETTLE_TIME           = 0.01  # seconds to let the emulator catch up before checking a cue
+LIVE_CHECK_CUES            = 50    # cues in the synthetic show --live-check fires at a lossless emulator
+LIVE_CHECK_SAMPLE          = 100   # parameters it verifies per cue when sampling, enough to take in mutes a cue sets twice
+
+################################################################################
+# Functions
+################################################################################
+
+def configure(num_chans, num_buses, num_auxins):
+
+    # lay out the synthetic spreadsheet, and return an X32Snippets config to read it, with everything optional on
+    # row 2 has the path numbers, row 3 the first channel names, and the cues start on row 4
+    # columns: cue number, label, 8 DCA labels, 2 other mutes, the channels, buses and aux ins, then the channel names
+
+    config = X32Snippets.Config()
+    config.SHEET_NAME = 'Sheet1'
+    config.SKIP_ROWS = 3
+    config.PATH_NUM_ROW = 2
+    config.CUE_NUM_COL = 1
+    config.CUE_LABEL_COL = 2
+    config.FIRST_DCA_COL = 3
+    config.NUM_DCAS = 8
+    config.OTHER_MUTES = True
+    config.OTHER_MUTES_COLS = [ 11, 12 ]
+    config.FIRST_CHAN_COL = 13
+    config.NUM_CHANS = num_chans
+    config.FIRST_BUS_COL = config.FIRST_CHAN_COL + num_chans
+    config.NUM_BUSES = num_buses
+    config.FIRST_AUXIN_COL = config.FIRST_BUS_COL + num_buses
+    config.NUM_AUXINS = num_auxins
+    config.NAME_CHANS = True
+    config.FIRST_CHAN_NAME_COL = config.FIRST_AUXIN_COL + num_auxins
+    config.FX_UNMUTE = True
+    return config
+
+def ods_cell(value):
+
+    # one cell of content.xml, numbers as float cells as a spreadsheet would save them
+
+    if value == '':
+        return '<table:table-cell/>'
+    if isinstance(value, int):
+        return '<table:table-cell office:value-type="float" office:value="' + str(value) + '"><text:p>' + str(value) + '</text:p></table:table-cell>'
+    return '<table:table-cell office:value-type="string"><text:p>' + escape(value) + '</text:p></table:table-cell>'
+
+def ods_row(cells):
+
+    # one row of content.xml, with runs of empty cells collapsed
+
+    xml = [ '<table:table-row>' ]
+    empty = 0
+    for value in cells:
+        if value == '':
+            empty = empty + 1
+            continue
+        if empty > 0:
+            xml.append('<table:table-cell table:number-columns-repeated="' + str(empty) + '"/>')
+            empty = 0
+        xml.append(ods_cell(value))
+    xml.append('</table:table-row>\n')
+    return ''.join(xml)
+
+def write_synthetic_show(config, ods_file_name, num_cues):
+
+    # write a random but repeatable show of num_cues cues, in the layout set by configure(),
+    # as an .ods, or as a flat XML spreadsheet if the file name ends in .fods
+
+    rand = random.Random(RANDOM_SEED)
+    num_paths = config.NUM_CHANS + config.NUM_BUSES + config.NUM_AUXINS
+    width = config.FIRST_CHAN_NAME_COL + config.NUM_CHANS - 1
+    dca_names = [ 'Leads', 'Chorus', 'Band', 'Reverb', 'Sh Dly', 'Kids', 'Villains and Henchmen', 'Trio', 'Ens', 'Solo' ]
+
+    def cells():
+        return [ '' ] * width
+
+    content = []
+
+    # title, path numbers and first channel names
+    row = cells()
+    row[0] = 'Synthetic show, ' + str(num_cues) + ' cues'
+    content.append(ods_row(row))
+    row = cells()
+    for (first_path_col, num_paths_of_type, osc_prefix) in X32Snippets.path_types(config):
+        for path in range(0, num_paths_of_type):
+            row[first_path_col + path - 1] = path + 1
+    content.append(ods_row(row))
+    row = cells()
+    for chan in range(0, config.NUM_CHANS):
+        row[config.FIRST_CHAN_NAME_COL + chan - 1] = 'Actor ' + str(chan + 1)
+    content.append(ods_row(row))
+
+    # cues, with a split marker now and again
+    for cue_index in range(0, num_cues):
+        if cue_index > 0 and cue_index % SPLIT_EVERY == 0:
+            row = cells()
+            row[config.CUE_NUM_COL - 1] = config.SPLIT_MARKER
+            content.append(ods_row(row))
+        row = cells()
+        row[config.CUE_NUM_COL - 1] = cue_index + 1
+        row[config.CUE_LABEL_COL - 1] = 'Scene ' + str(cue_index // 20 + 1) + ' cue ' + str(cue_index % 20 + 1)
+        for dca in range(0, config.NUM_DCAS):
+            if rand.random() < 0.7:
+                row[config.FIRST_DCA_COL + dca - 1] = rand.choice(dca_names)
+        for col in config.OTHER_MUTES_COLS:
+            if rand.random() < 0.5:
+                row[col - 1] = config.OTHER_MUTES_FIRST_CHAN + rand.randrange(0, config.OTHER_MUTES_NUM_CHANS)
+        for path in range(0, num_paths):
+            if rand.random() < 0.5:
+                dca = rand.randrange(1, config.NUM_DCAS + 1)
+                if rand.random() < 0.2:
+                    dca = -dca
+                row[config.FIRST_CHAN_COL + path - 1] = dca
+        for chan in range(0, config.NUM_CHANS):
+            if rand.random() < 0.05:
+                row[config.FIRST_CHAN_NAME_COL + chan - 1] = 'Actor ' + str(rand.randrange(1, 100))
+        content.append(ods_row(row))
+
+    row = cells()
+    row[config.CUE_NUM_COL - 1] = 'END'
+    content.append(ods_row(row))
+
+    # the same sheet either way, only the document around it differs
+    root = 'office:document-content'
+    mimetype = ''
+    if ods_file_name.endswith('.fods'):
+        root = 'office:document'
+        mimetype = ' office:mimetype="application/vnd.oasis.opendocument.spreadsheet"'
+    content.insert(0, '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<' + root + ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2"' + mimetype + '>'
+        '<office:body><office:spreadsheet><table:table table:name="' + config.SHEET_NAME + '">\n')
+    content.append('</table:table></office:spreadsheet></office:body></' + root + '>\n')
+    if ods_file_name.endswith('.fods'):
+        with open(ods_file_name, 'w', encoding='utf-8') as fods_file:
+            fods_file.write(''.join(content))
+        return
+
+    with zipfile.ZipFile(ods_file_name, 'w', zipfile.ZIP_DEFLATED) as ods_zip:
+        ods_zip.writestr(zipfile.ZipInfo('mimetype'), 'application/vnd.oasis.opendocument.spreadsheet')
+        ods_zip.writestr('META-INF/manifest.xml',
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">\n'
+            ' <manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>\n'
+            ' <manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>\n'
+            '</manifest:manifest>\n')
+        ods_zip.writestr('content.xml', ''.join(content))
+
+def run_stages(config, ods_file_name, out_dir, trace):
+
+    # build the show in separate stages, returning (stage, seconds, peak bytes allocated or None) for each
+    # read: the spreadsheet into a Sheet, model: the Sheet into a CueTable, render: the snippet and show
+    # texts, write: the files
+
+    results = []
+
+    def start():
+        if trace:
+            tracemalloc.start()
+        return time.perf_counter()
+
+    def finish(stage, start_time):
+        elapsed = time.perf_counter() - start_time
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append(( stage, elapsed, peak ))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = start()
+        sheet = X32Snippets.read_ods_sheet(config, ods_file_name)
+        finish('read', start_time)
+
+        start_time = start()
+        table = X32Snippets.build_cue_table(config, sheet)
+        finish('model', start_time)
+
+        start_time = start()
+        parts = X32Snippets.split_show(config, table)
+        names = X32Snippets.part_names('SHOW', parts)
+        files = []
+        for part in range(0, len(parts)):
+            files.extend(X32Snippets.build_part(config, table, names[part], parts[part][0], parts[part][1], parallel=config.PARALLEL_RENDER).files())
+        finish('render', start_time)
+
+        start_time = start()
+        for (file_name, text) in files:
+            with open(os.path.join(out_dir, file_name), 'w') as out_file:
+                out_file.write(text)
+        finish('write', start_time)
+
+    return (table.num_cues, results)
+
+def read_baselines(baseline_file_name):
+    try:
+        with open(baseline_file_name, 'r') as baseline_file:
+            return json.load(baseline_file)
+    except (OSError, ValueError):
+        return {}
+
+def compare(value, baseline):
+
+    # change from the baseline, flagged if it's a regression
+
+    if baseline is None or baseline == 0 or value is None:
+        return ''
+    change = (value - baseline) / baseline
+    flag = ''
+    if change > BASELINE_TOLERANCE:
+        flag = ' REGRESSION'
+    return '%+.0f%%' % (change * 100.0) + flag
+
+def run_show_benchmarks(cue_counts, num_chans, num_buses, num_auxins, parallel, baseline_file_name, save_baseline):
+    config = configure(num_chans, num_buses, num_auxins)
+    config.PARALLEL_RENDER = parallel
+    baselines = read_baselines(baseline_file_name)
+    for num_cues in cue_counts:
+        key = str(num_cues) + ' cues, ' + str(num_chans) + ' chans, ' + str(num_buses) + ' buses, ' + str(num_auxins) + ' auxins'
+        if parallel:
+            key = key + ', parallel'
+        baseline = baselines.get(key, {})
+        work_dir = tempfile.mkdtemp(prefix='X32Benchmark')
+        try:
+            ods_file_name = os.path.join(work_dir, 'synthetic.ods')
+            write_synthetic_show(config, ods_file_name, num_cues)
+            print('')
+            print('Show: ' + key + ' (' + '%.1f' % (os.path.getsize(ods_file_name) / 1048576.0) + 'MB .ods)')
+            print('')
+
+            # time it, then run it again measuring memory, as tracing slows everything down
+            (num_read, timings) = run_stages(config, ods_file_name, work_dir, False)
+            for repeat in range(1, REPEATS):
+                (num_read, repeat_timings) = run_stages(config, ods_file_name, work_dir, False)
+                for stage in range(0, len(timings)):
+                    if repeat_timings[stage][1] < timings[stage][1]:
+                        timings[stage] = repeat_timings[stage]
+            (num_read, memory) = run_stages(config, ods_file_name, work_dir, True)
+            if num_read != num_cues:
+                print('ERROR: Read ' + str(num_read) + ' cues from the synthetic show, not ' + str(num_cues))
+                sys.exit(1)
+
+            print('%-8s %10s %12s %16s %12s %16s' % ('stage', 'time (ms)', 'cues/s', 'vs baseline', 'peak (MB)', 'vs baseline'))
+            results = {}
+            total = 0.0
+            for stage in range(0, len(timings)):
+                (name, elapsed, unused) = timings[stage]
+                peak = memory[stage][2]
+                total = total + elapsed
+                results[name] = { 'time': elapsed, 'peak': peak }
+                old = baseline.get(name, {})
+                print('%-8s %10.1f %12.0f %16s %12.1f %16s' % (name, elapsed * 1000.0, num_cues / elapsed, compare(elapsed, old.get('time')), peak / 1048576.0, compare(peak, old.get('peak'))))
+            results['total'] = { 'time': total, 'peak': None }
+            print('%-8s %10.1f %12.0f %16s' % ('total', total * 1000.0, num_cues / total, compare(total, baseline.get('total', {}).get('time'))))
+            baselines[key] = results
+        finally:
+            shutil.rmtree(work_dir)
+
+    if save_baseline:
+        with open(baseline_file_name, 'w') as baseline_file:
+            json.dump(baselines, baseline_file, indent=1)
+        print('')
+        print('Saved baseline to ' + baseline_file_name)
+
+def run_read_check():
+
+    # write the same synthetic show as an .ods and as a flat .fods, and check both read into the same snippets
+    # returns False if they differ, or a file can't be read
+
+    config = configure(NUM_CHANS, NUM_BUSES, NUM_AUXINS)
+    work_dir = tempfile.mkdtemp(prefix='X32Benchmark')
+    try:
+        print('Read check: ' + str(READ_CHECK_CUES) + ' cues in each format')
+        print('')
+        print('%-8s %8s %10s' % ('format', 'cues', 'snippets'))
+        passed = True
+        first = None
+        for extension in [ '.ods', '.fods' ]:
+            file_name = os.path.join(work_dir, 'synthetic' + extension)
+            write_synthetic_show(config, file_name, READ_CHECK_CUES)
+            try:
+                table = X32Snippets.build_cue_table(config, X32Snippets.read_sheet(config, file_name))
+            except X32Snippets.ShowError as e:
+                print('%-8s %s' % (extension, 'ERROR: ' + e.message))
+                passed = False
+                continue
+            renderer = X32Snippets.SnippetRenderer(config, table)
+            snippets = [ renderer.render(cue_index) for cue_index in range(0, table.num_cues) ]
+            if first is None:
+                first = snippets
+            status = 'same'
+            if snippets != first:
+                status = 'DIFFERENT'
+                passed = False
+            print('%-8s %8d %10s' % (extension, table.num_cues, status))
+    finally:
+        shutil.rmtree(work_dir)
+    if not passed:
+        print('FAIL: the formats didn\'t all read into the same snippets')
+        return False
+    print('PASS: every format read into the same snippets')
+    return True
+
+def time_command(args):
+
+    # median wall time of running a command, with its output thrown away
+
+    times = []
+    for run in range(0, STARTUP_RUNS):
+        start = time.perf_counter()
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2]
+
+def run_startup_benchmarks():
+
+    # how long it takes to start up, as a build wrapper calling the script once per show pays it every time
+    # returns False if bad arguments take longer than STARTUP_LIMIT to be reported
+
+    import py_compile
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'X32Snippets.py')
+    launcher = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'X32Run.py')
+    python = sys.executable
+
+    # compile the module into __pycache__ now, even if PYTHONDONTWRITEBYTECODE is set, so imports are timed
+    # as they run after the first one
+    py_compile.compile(script)
+
+    print('%-40s %10s' % ('command', 'time (ms)'))
+    print('%-40s %10.1f' % ('python (nothing)', time_command([ python, '-c', 'pass' ]) * 1000.0))
+    print('%-40s %10.1f' % ('import X32Snippets', time_command([ python, '-c', 'import X32Snippets' ]) * 1000.0))
+    usage = time_command([ python, script ])
+    print('%-40s %10.1f' % ('X32Snippets.py (no arguments)', usage * 1000.0))
+    bad = time_command([ python, script, '--bad-option', 'show.ods', 'SHOW' ])
+    print('%-40s %10.1f' % ('X32Snippets.py --bad-option', bad * 1000.0))
+    print('%-40s %10.1f' % ('X32Run.py --bad-option', time_command([ python, launcher, '--bad-option', 'show.ods', 'SHOW' ]) * 1000.0))
+    if max(usage, bad) >= STARTUP_LIMIT:
+        print('FAIL: bad arguments took over ' + str(int(STARTUP_LIMIT * 1000.0)) + 'ms to report')
+        return False
+    print('PASS: bad arguments reported in under ' + str(int(STARTUP_LIMIT * 1000.0)) + 'ms')
+    return True
+
+def fire_show(config, table, emulator):
+
+    # fire every cue of the show at an emulator, returning the time spent sending, the LiveShow,
+    # and the number of cues that didn't leave the emulator with every parameter at its final value
+
+    port = emulator.start(0)
+    elapsed = 0.0
+    bad_cues = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        show = X32Snippets.LiveShow(config, table, '127.0.0.1', port)
+        for cue_index in range(0, table.num_cues):
+            start = time.perf_counter()
+            show.go()
+            elapsed = elapsed + time.perf_counter() - start
+            time.sleep(LIVE_SETTLE_TIME)
+            with emulator.lock:
+                for (address, args) in X32Snippets.final_parameters(show.cue_packets[cue_index][0]):
+                    if emulator.state.get(address) != args[0]:
+                        bad_cues = bad_cues + 1
+                        break
+    emulator.stop()
+    return (elapsed, show, bad_cues)
+
+def benchmark_live(config, table, bundles, pacing):
+
+    # fire every cue of the show at an emulated console that drops packets,
+    # returning the time spent sending, the packets sent and dropped, the resends,
+    # the number of cues that didn't fully arrive, and the rate the pacing settled at
+
+    config.LIVE_BUNDLES = bundles
+    config.LIVE_PACING = pacing
+    emulator = X32Emulator.X32Emulator(True, LIVE_DROP_RATE, LIVE_CONSOLE_RATE, LIVE_BUFFER_PACKETS)
+    (elapsed, show, bad_cues) = fire_show(config, table, emulator)
+    rate = 0
+    if show.bucket is not None:
+        rate = int(show.bucket.rate)
+    return (elapsed, emulator.stats.packets, emulator.stats.dropped, show.resends, bad_cues, rate)
+
+def run_live_benchmarks(ods_file_name):
+    config = X32Snippets.Config()
+    table = X32Snippets.read_show_table(config, ods_file_name)
+    print('Live: ' + str(table.num_cues) + ' cues against a console getting through ' + str(LIVE_CONSOLE_RATE) + ' packets/s with a ' + str(LIVE_BUFFER_PACKETS) + ' packet buffer, losing ' + str(LIVE_DROP_RATE * 100) + '% anyway')
+    print('')
+    print('%-10s %-8s %10s %8s %8s %8s %10s %10s' % ('packing', 'pacing', 'send (ms)', 'packets', 'dropped', 'resends', 'bad cues', 'final rate'))
+    for bundles in [ False, True ]:
+        for pacing in [ False, True ]:
+            (elapsed, packets, dropped, resends, bad_cues, rate) = benchmark_live(config, table, bundles, pacing)
+            packing = 'single'
+            if bundles:
+                packing = 'bundles'
+            paced = 'off'
+            if pacing:
+                paced = 'on'
+            print('%-10s %-8s %10.1f %8d %8d %8d %10d %10s' % (packing, paced, elapsed * 1000.0, packets, dropped, resends, bad_cues, str(rate or '-')))
+
+def run_live_check():
+
+    # fire a synthetic show, whose OTHER_MUTES channels are also paths, so cues set some mutes twice,
+    # and with a DCA label longer than the console keeps,
+    # at an emulator that loses nothing, both verifying every parameter and a sample of them
+    # returns False if any cue needed a resend or didn't arrive, as nothing was lost to resend
+
+    config = configure(NUM_CHANS, NUM_BUSES, NUM_AUXINS)
+    config.LIVE_VERIFY_SAMPLE = LIVE_CHECK_SAMPLE
+    work_dir = tempfile.mkdtemp(prefix='X32Benchmark')
+    try:
+        ods_file_name = os.path.join(work_dir, 'synthetic.ods')
+        write_synthetic_show(config, ods_file_name, LIVE_CHECK_CUES)
+        table = X32Snippets.read_show_table(config, ods_file_name)
+    finally:
+        shutil.rmtree(work_dir)
+    print('Live check: ' + str(table.num_cues) + ' cues against a lossless console')
+    print('')
+    print('%-10s %-8s %8s %10s' % ('packing', 'verify', 'resends', 'bad cues'))
+    passed = True
+    for bundles in [ False, True ]:
+        for verify in [ False, True ]:
+            config.LIVE_BUNDLES = bundles
+            config.LIVE_VERIFY = verify
+            emulator = X32Emulator.X32Emulator(bundles, 0.0, None)
+            (elapsed, show, bad_cues) = fire_show(config, table, emulator)
+            packing = 'single'
+            if bundles:
+                packing = 'bundles'
+            checked = 'sample'
+            if verify:
+                checked = 'all'
+            print('%-10s %-8s %8d %10d' % (packing, checked, show.resends, bad_cues))
+            if show.resends > 0 or bad_cues > 0:
+                passed = False
+    if not passed:
+        print('FAIL: cues were resent or didn\'t arrive with nothing lost')
+        return False
+    print('PASS: every cue arrived first time')
+    return True
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+
+    title = '# X32 Benchmark v' + VERSION
+    print('#' * len(title))
+    print(title)
+    print('#' * len(title))
+
+    #
+    # validate command-line parameters
+    #
+
+    options = {}
+    for arg in sys.argv[1:]:
+        if arg.startswith('--'):
+            (name, equals, value) = arg.partition('=')
+            options[name] = value
+    params = [ arg for arg in sys.argv[1:] if not arg.startswith('--') ]
+
+    usage = False
+    for option in options:
+        if option not in [ '--live', '--live-check', '--read-check', '--startup', '--cues', '--chans', '--buses', '--auxins', '--baseline', '--save-baseline', '--parallel' ]:
+            usage = True
+    if '--live' in options:
+        usage = usage or len(params) != 1 or len(options) > 1
+    elif '--startup' in options or '--live-check' in options or '--read-check' in options:
+        usage = usage or len(params) != 0 or len(options) > 1
+    else:
+        usage = usage or len(params) != 0
+    try:
+        cue_counts = [ int(n) for n in options.get('--cues', ','.join([ str(n) for n in CUE_COUNTS ])).split(',') ]
+        num_chans = int(options.get('--chans', str(NUM_CHANS)))
+        num_buses = int(options.get('--buses', str(NUM_BUSES)))
+        num_auxins = int(options.get('--auxins', str(NUM_AUXINS)))
+    except ValueError:
+        usage = True
+
+    if usage:
+        print("")
+        print("Usage: X32Benchmark.py [--cues=<n>[,<n>...]] [--chans=<n>] [--buses=<n>] [--auxins=<n>] [--parallel] [--baseline=<json_file_name>] [--save-baseline]")
+        print("       X32Benchmark.py --live <ods_file_name>")
+        print("       X32Benchmark.py --live-check")
+        print("       X32Benchmark.py --read-check")
+        print("       X32Benchmark.py --startup")
+        sys.exit(0)
+
+    if '--live' in options:
+        run_live_benchmarks(params[0])
+    elif '--read-check' in options:
+        if not run_read_check():
+            sys.exit(1)
+    elif '--live-check' in options:
+        if not run_live_check():
+            sys.exit(1)
+    elif '--startup' in options:
+        if not run_startup_benchmarks():
+            sys.exit(1)
+    else:
+        run_show_benchmarks(cue_counts, num_chans, num_buses, num_auxins, '--parallel' in options, options.get('--baseline', BASELINE_FILE), '--save-baseline' in options)
+
+    print('Done!')
@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+
+################################################################################
+#
+# X32 Emulator
+#
+# A stand-in for an X32/M32 console, for checking the output of X32Snippets
+# and benchmarking live mode without a desk
+#
+# Free for non-commercial use
+#
+################################################################################
+
+VERSION = "1.0"
+
+################################################################################
+# Imports
+################################################################################
+
+import os
+import random
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+
+# the OSC encoding and snippet command conversion are shared with X32Snippets, so there is only one copy
+from X32Snippets import osc_message, command_to_osc, X32_NAME_LENGTH
+
+################################################################################
+# Constants
+################################################################################
+
+CONSOLE_PORT               = 10023 # UDP port the real console listens for OSC on
+BUFFER_PACKETS             = 64    # packets the simulated receive buffer holds, when simulating a console rate
+
+# the parameters the emulator understands, with their OSC type and the number of each kind of path
+# anything else is counted as unsupported and otherwise ignored, as the console would
+
+PARAMETERS = [
+    ( re.compile(r'^/ch/(\d\d)/mix/on$'), 'i' ),
+    ( re.compile(r'^/ch/(\d\d)/grp/dca$'), 'i' ),
+    ( re.compile(r'^/ch/(\d\d)/config/name$'), 's' ),
+    ( re.compile(r'^/ch/(\d\d)/mix/(\d\d)/on$'), 'i' ),
+    ( re.compile(r'^/bus/(\d\d)/mix/on$'), 'i' ),
+    ( re.compile(r'^/bus/(\d\d)/grp/dca$'), 'i' ),
+    ( re.compile(r'^/bus/(\d\d)/config/name$'), 's' ),
+    ( re.compile(r'^/auxin/(\d\d)/mix/on$'), 'i' ),
+    ( re.compile(r'^/auxin/(\d\d)/grp/dca$'), 'i' ),
+    ( re.compile(r'^/auxin/(\d\d)/config/name$'), 's' ),
+    ( re.compile(r'^/dca/(\d)/config/name$'), 's' ),
+    ( re.compile(r'^/dca/(\d)/config/color$'), 'i' ),
+]
+
+PATH_COUNTS = { 'ch': 32, 'bus': 16, 'auxin': 8, 'dca': 8, 'mix': 16 }
+
+################################################################################
+# Functions
+################################################################################
+
+def read_osc_string(data, offset):
+
+    # returns the string starting at offset and the offset of whatever follows it
+
+    end = data.index(b'\0', offset)
+    return (data[offset:end].decode('utf-8', 'replace'), end + 4 - (end % 4))
+
+def decode_osc(data):
+
+    # decode an OSC packet into a list of (address, args) messages, unpacking bundles
+
+    if data.startswith(b'#bundle\0'):
+        messages = []
+        offset = 16
+        while offset + 4 <= len(data):
+            size = struct.unpack_from('>i', data, offset)[0]
+            messages.extend(decode_osc(data[offset + 4:offset + 4 + size]))
+            offset = offset + 4 + size
+        return messages
+    (address, offset) = read_osc_string(data, 0)
+    args = []
+    if offset < len(data):
+        (tags, offset) = read_osc_string(data, offset)
+        for tag in tags[1:]:
+            if tag == 'i':
+                args.append(struct.unpack_from('>i', data, offset)[0])
+                offset = offset + 4
+            elif tag == 'f':
+                args.append(struct.unpack_from('>f', data, offset)[0])
+                offset = offset + 4
+            elif tag == 's':
+                (arg, offset) = read_osc_string(data, offset)
+                args.append(arg)
+            else:
+                raise ValueError('unsupported OSC type tag ' + tag)
+    return [ ( address, args ) ]
+
+def parameter_type(address):
+
+    # the OSC type of a supported parameter, or None
+
+    for (pattern, osc_type) in PARAMETERS:
+        match = pattern.match(address)
+        if match:
+            kinds = [ k for k in address.split('/') if k in PATH_COUNTS ]
+            for (kind, number) in zip(kinds, match.groups()):
+                if int(number) < 1 or int(number) > PATH_COUNTS[kind]:
+                    return None
+            return osc_type
+    return None
+
+class Stats:
+
+    # per-message processing statistics
+
+    def __init__(self):
+        self.packets = 0
+        self.messages = 0
+        self.bytes = 0
+        self.sets = 0
+        self.queries = 0
+        self.unsupported = 0
+        self.dropped = 0
+        self.processing_time = 0.0
+        self.max_processing_time = 0.0
+        self.first_time = None
+        self.last_time = None
+
+    def report(self):
+        lines = []
+        lines.append('packets:      ' + str(self.packets) + ' (' + str(self.dropped) + ' dropped)')
+        lines.append('messages:     ' + str(self.messages) + ' (' + str(self.sets) + ' sets, ' + str(self.queries) + ' queries, ' + str(self.unsupported) + ' unsupported)')
+        lines.append('bytes:        ' + str(self.bytes))
+        if self.messages > 0:
+            lines.append('processing:   ' + '%.1f' % (self.processing_time * 1000000.0 / self.messages) + 'us/message average, ' + '%.1f' % (self.max_processing_time * 1000000.0) + 'us max')
+        if self.first_time is not None and self.last_time > self.first_time:
+            elapsed = self.last_time - self.first_time
+            lines.append('throughput:   ' + '%.0f' % (self.messages / elapsed) + ' messages/s over ' + '%.3f' % elapsed + 's')
+        return '\n'.join(lines)
+
+class X32Emulator:
+
+    # in-memory console state, fed either by OSC over UDP or directly from .shw/.snp files
+    # state maps each OSC parameter address to its current value
+
+    def __init__(self, accept_bundles=True, drop_rate=0.0, console_rate=None, buffer_packets=BUFFER_PACKETS):
+        self.state = {}
+        self.stats = Stats()
+        self.accept_bundles = accept_bundles
+
+        # simulated loss: drop_rate is the chance of losing any packet, and console_rate, if given,
+        # is how many packets per second the console gets through, with anything arriving while
+        # buffer_packets are already waiting dropped, as a busy console's overflowing buffer would
+        self.drop_rate = drop_rate
+        self.console_rate = console_rate
+        self.buffer_packets = buffer_packets
+        self.queue = 0.0
+        self.queue_time = time.perf_counter()
+        self.random = random.Random(0)
+
+        self.lock = threading.Lock()
+        self.sock = None
+        self.thread = None
+        self.running = False
+
+    def apply(self, address, args):
+
+        # apply one OSC message, returning the reply for a query (no arguments) or None
+
+        osc_type = parameter_type(address)
+        if osc_type is None:
+            self.stats.unsupported = self.stats.unsupported + 1
+            return None
+        if len(args) == 0:
+            self.stats.queries = self.stats.queries + 1
+            value = self.state.get(address)
+            if value is None:
+                if osc_type == 's':
+                    value = ''
+                else:
+                    value = 0
+            return osc_message(address, [ value ])
+        value = args[0]
+        if osc_type == 'i' and not isinstance(value, int):
+            value = int(value)
+        if osc_type == 's':
+            # names are cut short, as the console only keeps so many characters of them
+            value = str(value)[:X32_NAME_LENGTH]
+        self.state[address] = value
+        self.stats.sets = self.stats.sets + 1
+        return None
+
+    def lost(self, now):
+
+        # whether the simulated network or console loses a packet arriving now
+
+        if self.console_rate is not None:
+            self.queue = max(0.0, self.queue - (now - self.queue_time) * self.console_rate)
+            self.queue_time = now
+            if self.queue + 1 > self.buffer_packets:
+                return True
+            self.queue = self.queue + 1
+        return self.drop_rate > 0 and self.random.random() < self.drop_rate
+
+    def handle_packet(self, data):
+
+        # process one UDP packet, returning any replies
+
+        start = time.perf_counter()
+        replies = []
+        with self.lock:
+            self.stats.packets = self.stats.packets + 1
+            self.stats.bytes = self.stats.bytes + len(data)
+            if self.lost(start):
+                self.stats.dropped = self.stats.dropped + 1
+                return replies
+            if not self.accept_bundles and data.startswith(b'#bundle\0'):
+                # as older firmware does, silently
+                self.stats.dropped = self.stats.dropped + 1
+                return replies
+            try:
+                messages = decode_osc(data)
+            except Exception:
+                self.stats.unsupported = self.stats.unsupported + 1
+                return replies
+            for (address, args) in messages:
+                message_start = time.perf_counter()
+                reply = self.apply(address, args)
+                if reply is not None:
+                    replies.append(reply)
+                message_time = time.perf_counter() - message_start
+                self.stats.messages = self.stats.messages + 1
+                self.stats.max_processing_time = max(self.stats.max_processing_time, message_time)
+            self.stats.processing_time = self.stats.processing_time + time.perf_counter() - start
+            now = time.time()
+            if self.stats.first_time is None:
+                self.stats.first_time = now
+            self.stats.last_time = now
+        return replies
+
+    def apply_snippet(self, snp_file_name):
+
+        # apply every command in a snippet file, as recalling it on the console would
+
+        with open(snp_file_name, 'r') as snp_file:
+            lines = snp_file.read().splitlines()
+        with self.lock:
+            start = time.perf_counter()
+            for line in lines[1:]:
+                if line.strip() == '':
+                    continue
+                message_start = time.perf_counter()
+                (address, args) = command_to_osc(line)
+                self.apply(address, args)
+                message_time = time.perf_counter() - message_start
+                self.stats.messages = self.stats.messages + 1
+                self.stats.max_processing_time = max(self.stats.max_processing_time, message_time)
+            self.stats.processing_time = self.stats.processing_time + time.perf_counter() - start
+            now = time.time()
+            if self.stats.first_time is None:
+                self.stats.first_time = now
+            self.stats.last_time = now
+
+    def load_show(self, shw_file_name):
+
+        # read a show file, returning its cues as (cue number, label, snippet file name)
+
+        show_dir = os.path.dirname(shw_file_name)
+        show_name = os.path.splitext(os.path.basename(shw_file_name))[0]
+        cues = []
+        with open(shw_file_name, 'r') as shw_file:
+            for line in shw_file.read().splitlines():
+                match = re.match(r'^cue/\d+ (\d+) "(.*)" \d+ -?\d+ (-?\d+) ', line)
+                if match:
+                    snp_index = int(match.group(3))
+                    snp_file_name = None
+                    if snp_index >= 0:
+                        snp_file_name = os.path.join(show_dir, show_name + '.' + str(snp_index).zfill(3) + '.snp')
+                    cues.append(( match.group(1), match.group(2), snp_file_name ))
+        return cues
+
+    def start(self, port=CONSOLE_PORT, host='127.0.0.1'):
+
+        # listen for OSC in a background thread, returning the bound port (pass 0 for any free port)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(( host, port ))
+        self.sock.settimeout(0.1)
+        self.running = True
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+        return self.sock.getsockname()[1]
+
+    def serve(self):
+        while self.running:
+            try:
+                (data, sender) = self.sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            for reply in self.handle_packet(data):
+                self.sock.sendto(reply, sender)
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        if self.sock is not None:
+            self.sock.close()
+
+    def dump(self):
+
+        # the state as sorted lines, for comparing
+
+        with self.lock:
+            return [ address + ' ' + repr(self.state[address]) for address in sorted(self.state) ]
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+
+    title = '# X32 Emulator v' + VERSION
+    print('#' * len(title))
+    print(title)
+    print('#' * len(title))
+
+    #
+    # validate command-line parameters
+    #
+
+    options = {}
+    for arg in sys.argv[1:]:
+        if arg.startswith('--'):
+            (name, equals, value) = arg.partition('=')
+            options[name] = value
+    params = [ arg for arg in sys.argv[1:] if not arg.startswith('--') ]
+
+    usage = len(params) > 1
+    for option in options:
+        if option not in [ '--port', '--cue', '--no-bundles', '--drop-rate', '--console-rate', '--buffer' ]:
+            usage = True
+
+    if usage:
+        print("")
+        print("Usage: X32Emulator.py [--port=<udp_port>] [--no-bundles] [--drop-rate=<fraction>] [--console-rate=<packets_per_second>] [--buffer=<packets>]")
+        print("       X32Emulator.py [--cue=<cue_index>] <shw_file_name>")
+        sys.exit(0)
+
+    console_rate = None
+    if '--console-rate' in options:
+        console_rate = float(options['--console-rate'])
+    emulator = X32Emulator('--no-bundles' not in options, float(options.get('--drop-rate', '0')), console_rate, int(options.get('--buffer', str(BUFFER_PACKETS))))
+
+    #
+    # play a show from files
+    #
+
+    if len(params) == 1:
+        cues = emulator.load_show(params[0])
+        last_cue = len(cues) - 1
+        if '--cue' in options:
+            last_cue = int(options['--cue'])
+        for cue_index in range(0, last_cue + 1):
+            if cues[cue_index][2] is not None:
+                emulator.apply_snippet(cues[cue_index][2])
+        print('State after cue "' + cues[last_cue][0] + '", label "' + cues[last_cue][1] + '":')
+        for line in emulator.dump():
+            print(line)
+        print(emulator.stats.report())
+        sys.exit(0)
+
+    #
+    # be a console on the network
+    #
+
+    port = CONSOLE_PORT
+    if '--port' in options:
+        port = int(options['--port'])
+    emulator.start(port, '0.0.0.0')
+    print('Listening for OSC on UDP port ' + str(port) + ' (Ctrl-C to stop)...')
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        print('')
+    emulator.stop()
+    for line in emulator.dump():
+        print(line)
+    print(emulator.stats.report())
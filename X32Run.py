@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+
+################################################################################
+#
+# X32 Run
+#
+# Runs X32Snippets.py with the same arguments, but starts faster: Python compiles a script it is given
+# to run from scratch every time, but keeps the compiled form of a module it imports (in __pycache__),
+# so this imports X32Snippets instead, which is only compiled again after it is changed
+#
+# Free for non-commercial use
+#
+################################################################################
+
+import X32Snippets
+
+X32Snippets.main()
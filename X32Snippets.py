@@ -27,9 +27,21 @@ VERSION = "2.0" # port to Python 3
 
 import time
 import sys
-import string
+import os
+import io
+import copy
+import importlib
+import select
+import struct
 
-from pyexcel_ods import get_data
+from array import array
+from bisect import bisect_right
+from xml.parsers import expat
+
+# slower to load, and only needed by some runs, so imported where they are used, to keep startup fast:
+# zipfile (reading .ods), pyexcel (other spreadsheet formats), concurrent.futures (split shows, --batch and --parallel),
+# ast (--batch config files), socket (live mode), cProfile and pstats (--profile), tracemalloc (--timings),
+# json and hashlib (manifests and --json), datetime and re (date and time cells)
 
 
 ################################################################################
@@ -80,310 +92,2163 @@ OTHER_MUTES_FIRST_CHAN     = 17    # first board channel for the band
 OTHER_MUTES_NUM_CHANS      = 8     # number of consecutive board channels for the band
 OTHER_MUTES_COLS           = [ ]   # spreadsheet column of data for first channel to mute
 
+DEDUPE_SNIPPETS            = False # cues with exactly the same commands share a single snippet
+
+DELTA_SNIPPETS             = False # only send the parameters that changed since the previous cue
+DELTA_KEYFRAME_INTERVAL    = 10    # except every this many cues, which send everything (0 = first cue only)
+
+MAX_SHOW_CUES              = 500   # number of cues the console can hold in one show
+MAX_SHOW_SNIPPETS          = 100   # number of snippets the console can hold in one show
+SPLIT_MARKER               = 'BREAK' # cue column marker for a good place to split a show that is too big (e.g. the interval)
+
+PARALLEL_RENDER            = False # render the snippets in chunks across all the CPUs, and write them several at once (or --parallel)
+PARALLEL_CHUNK_CUES        = 250   # cues rendered by each task
+PARALLEL_WRITE_THREADS     = 8     # files written at once
+
+LOG_MODE                   = 'quiet' # 'quiet' (errors and a summary), 'verbose' (also every cue and skipped row) or 'json' (every event as a line of JSON) (or --verbose, --json)
+LOG_BUFFER_SIZE            = 65536 # characters of output to collect before writing them out
+
+# .ods and .fods files are read natively, anything else with pyexcel, using the plugin package for the extension
+PYEXCEL_READERS            = { '.xlsx': 'pyexcel_xlsx', '.xlsm': 'pyexcel_xlsx', '.xls': 'pyexcel_xls' }
+PYEXCEL_DEFAULT_READER     = 'pyexcel_io' # for any other extension, with whatever plugins are installed
+
+################################################################################
+# Live mode (--live)
+################################################################################
+
+CONSOLE_PORT               = 10023 # UDP port the console listens for OSC on
+LIVE_CONTROL_PORT          = 10024 # local UDP port for GO/back/standby commands from other programs
+LIVE_BUNDLES               = True  # pack each cue's messages into OSC bundles (single messages if the console doesn't answer a bundle)
+LIVE_MTU                   = 1472  # largest datagram to send: a 1500 byte Ethernet MTU less the IP and UDP headers
+LIVE_PROBE_TIMEOUT         = 0.5   # seconds to wait for the console to answer the bundle probe
+LIVE_PACING                = True  # pace packets with a token bucket, and check a sample of each cue with queries, adapting the rate to any loss
+LIVE_INITIAL_RATE          = 1000  # packets per second to start at
+LIVE_MIN_RATE              = 50    # packets per second never to drop below
+LIVE_MAX_RATE              = 20000 # packets per second never to go above
+LIVE_BURST                 = 8     # packets that can go back to back before pacing kicks in
+LIVE_VERIFY_SAMPLE         = 8     # parameters queried after each cue
+LIVE_VERIFY_TIMEOUT        = 0.1   # seconds to wait for the answers to the queries
+LIVE_RESENDS               = 2     # times a cue is sent again, more slowly, if the check finds it didn't all arrive
+LIVE_VERIFY                = False # query every parameter each cue sets, rather than a sample, and report any that are wrong (or --verify)
+
+X32_COLORS                 = [ 'OFF', 'RD', 'GN', 'YE', 'BL', 'MG', 'CY', 'WH', 'OFFi', 'RDi', 'GNi', 'YEi', 'BLi', 'MGi', 'CYi', 'WHi' ]
+X32_NAME_LENGTH            = 12    # characters of a channel, bus, aux in or DCA name the console keeps
+
+################################################################################
+# Watch mode (--watch)
+################################################################################
+
+WATCH_DEBOUNCE             = 0.3   # seconds the spreadsheet must be left alone after a save before regenerating
+WATCH_POLL_INTERVAL        = 0.25  # seconds between checks where inotify is not available
+
+INOTIFY_CREATE             = 0x00000100
+INOTIFY_CLOSE_WRITE        = 0x00000008
+INOTIFY_MOVED_TO           = 0x00000080
+
+################################################################################
+# Settings making up a Config (the values above are the defaults)
+################################################################################
+
+CONFIG_NAMES = [
+    'SHEET_NAME', 'SKIP_ROWS', 'CUE_NUM_COL', 'CUE_LABEL_COL', 'PATH_NUM_ROW',
+    'FIRST_CHAN_COL', 'NUM_CHANS', 'FIRST_BUS_COL', 'NUM_BUSES', 'FIRST_AUXIN_COL', 'NUM_AUXINS',
+    'FIRST_DCA_COL', 'NUM_DCAS', 'DCA_COLOR', 'NAME_CHANS', 'FIRST_CHAN_NAME_COL',
+    'DCA_ALT_LABEL_COLORS', 'DCA_ALT_LABELS', 'DCA_ALT_LABEL_COLOR',
+    'DCA_ACTIVE_ON_NEXT_CUE', 'DCA_ACTIVE_ON_NEXT_CUE_COLOR', 'DCA_SAME_ON_NEXT_CUE', 'DCA_SAME_ON_NEXT_CUE_COLOR',
+    'FX_UNMUTE', 'FX_UNMUTE_BUS', 'OTHER_MUTES', 'OTHER_MUTES_FIRST_CHAN', 'OTHER_MUTES_NUM_CHANS', 'OTHER_MUTES_COLS',
+    'DEDUPE_SNIPPETS', 'DELTA_SNIPPETS', 'DELTA_KEYFRAME_INTERVAL', 'MAX_SHOW_CUES', 'MAX_SHOW_SNIPPETS', 'SPLIT_MARKER',
+    'PARALLEL_RENDER', 'PARALLEL_CHUNK_CUES', 'PARALLEL_WRITE_THREADS',
+    'LOG_MODE', 'LOG_BUFFER_SIZE', 'PYEXCEL_READERS', 'PYEXCEL_DEFAULT_READER',
+    'LIVE_CONTROL_PORT', 'LIVE_BUNDLES', 'LIVE_MTU', 'LIVE_PROBE_TIMEOUT', 'LIVE_PACING', 'LIVE_INITIAL_RATE',
+    'LIVE_MIN_RATE', 'LIVE_MAX_RATE', 'LIVE_BURST', 'LIVE_VERIFY_SAMPLE', 'LIVE_VERIFY_TIMEOUT', 'LIVE_RESENDS', 'LIVE_VERIFY',
+    'WATCH_DEBOUNCE', 'WATCH_POLL_INTERVAL' ]
+
 ################################################################################
 # Functions
 ################################################################################
 
+class ShowError(Exception):
+
+    # an error in a config file or spreadsheet, raised by the functions that find it, so a program importing
+    # this one decides what to do about it, with where it was found (1-based row and column, or config file line)
+
+    def __init__(self, message, row=None, column=None, line=None):
+        Exception.__init__(self, message)
+        self.message = message
+        self.row = row
+        self.column = column
+        self.line = line
+
+    def fields(self):
+
+        # where it was found, as fields for Log.error()
+
+        fields = {}
+        for name in [ 'row', 'column', 'line' ]:
+            if getattr(self, name) is not None:
+                fields[name] = getattr(self, name)
+        return fields
+
+class Config:
+
+    # every setting for building (and firing) a show, as attributes named after the constants above
+    # it starts from the values in this file, so editing them still works, but a program importing this
+    # one can build differently laid out shows side by side, passing each its own Config:
+    #   config = X32Snippets.Config(FIRST_CHAN_COL=13, NUM_CHANS=32)
+    #   show = X32Snippets.build_show(config, X32Snippets.read_sheet(config, 'show.ods'), 'SHOW')
+
+    def __init__(self, **settings):
+        for name in CONFIG_NAMES:
+            setattr(self, name, copy.deepcopy(globals()[name]))
+        for name in settings:
+            if name not in CONFIG_NAMES:
+                raise ShowError("Unknown setting '" + name + "'")
+            setattr(self, name, settings[name])
+
+def read_config(config_file_name):
+
+    # read a show's config file, for --batch: one NAME = value line for each setting that differs from
+    # the top of this file, written the same way, plus ODS_FILE_NAME and SHOW_NAME, with # comments
+    # returns (config, ods_file_name, show_name)
+
+    import ast
+    try:
+        with open(config_file_name, 'r') as config_file:
+            lines = config_file.read().splitlines()
+    except OSError as e:
+        raise ShowError("Could not read config file '" + config_file_name + "': " + str(e))
+    settings = {}
+    for line_index in range(0, len(lines)):
+        line = lines[line_index].strip()
+        if line == '' or line.startswith('#'):
+            continue
+        (name, equals, text) = line.partition('=')
+        name = name.strip()
+        if equals == '' or (name not in CONFIG_NAMES and name not in [ 'ODS_FILE_NAME', 'SHOW_NAME' ]):
+            raise ShowError("Found invalid setting at line " + str(line_index + 1) + " of config file '" + config_file_name + "'", line=line_index + 1)
+
+        # the value is everything up to whichever # starts the comment, if any
+        ends = [ len(text) ] + [ end for end in range(len(text) - 1, -1, -1) if text[end] == '#' ]
+        for end in ends:
+            try:
+                settings[name] = ast.literal_eval(text[:end].strip())
+                break
+            except (ValueError, SyntaxError):
+                pass
+        if name not in settings:
+            raise ShowError("Found invalid value for " + name + " at line " + str(line_index + 1) + " of config file '" + config_file_name + "'", line=line_index + 1)
+    for name in [ 'ODS_FILE_NAME', 'SHOW_NAME' ]:
+        if name not in settings:
+            raise ShowError("Found no " + name + " in config file '" + config_file_name + "'")
+    ods_file_name = settings.pop('ODS_FILE_NAME')
+    show_name = settings.pop('SHOW_NAME')
+    return (Config(**settings), ods_file_name, show_name)
+
+class Log:
+
+    # levelled, buffered output for builds
+    # levels, most important first, are error, warning, summary, info and debug: quiet mode shows
+    # summary and above, verbose mode everything, and json mode writes every event as one JSON
+    # object per line, with its fields, for other programs to read instead of scraping the text
+    # output is collected and written out in large blocks, and at once for errors
+    # none mode writes nothing at all, for a program importing this one that doesn't want the output
+
+    LEVELS = [ 'error', 'warning', 'summary', 'info', 'debug' ]
+    PREFIXES = { 'error': 'ERROR: ', 'warning': 'WARNING: ', 'debug': 'DEBUG: ' }
+
+    def __init__(self, mode, buffer_size):
+        self.lines = []
+        self.size = 0
+        self.buffer_size = buffer_size
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.threshold = Log.LEVELS.index('summary')
+        if mode == 'none':
+            self.threshold = -1
+        elif mode != 'quiet':
+            self.threshold = Log.LEVELS.index('debug')
+
+    def wants(self, level):
+        return Log.LEVELS.index(level) <= self.threshold
+
+    def event(self, level, event, message, **fields):
+        if Log.LEVELS.index(level) > self.threshold:
+            return
+        if self.mode == 'json':
+            import json
+            record = { 'level': level, 'event': event, 'message': message }
+            record.update(fields)
+            line = json.dumps(record)
+        else:
+            line = Log.PREFIXES.get(level, '') + message
+        self.lines.append(line)
+        self.size = self.size + len(line)
+        if self.size >= self.buffer_size or level == 'error':
+            self.flush()
+
+    def error(self, message, **fields):
+        self.event('error', 'error', message, **fields)
+
+    def warning(self, message, **fields):
+        self.event('warning', 'warning', message, **fields)
+
+    def summary(self, event, message, **fields):
+        self.event('summary', event, message, **fields)
+
+    def info(self, event, message, **fields):
+        self.event('info', event, message, **fields)
+
+    def debug(self, event, message, **fields):
+        self.event('debug', event, message, **fields)
+
+    def flush(self):
+        if len(self.lines) > 0:
+            sys.stdout.write('\n'.join(self.lines) + '\n')
+            sys.stdout.flush()
+            self.lines = []
+            self.size = 0
+
+# the log for library functions that aren't given one
+NO_LOG = Log('none', LOG_BUFFER_SIZE)
+
 def read_cell_as_string(d, r, c):
 
     # robust function to pull contents of a spreadsheet cell as a string, regardless of actual contents
     # incoming indices are 1-based
 
     try:
-        #print("DEBUG: Accessing row " + str(r) + ", cell " + str(c))
-        row = d[r - 1]
-        cell = row[c - 1]
-        #print("DEBUG: row " + str(r) + ", cell " + str(c) + " is type " + str(type(cell)))
-        #if type(cell) == unicode:
-        #    print("DEBUG:  unicode")
-        #    cell = cell.encode('utf-8')
-        #else:
-        #    print("DEBUG:  not unicode")
-        s = str(cell)
-        #print("DEBUG: '" + s + "'")
-        return s
+        return d.cell(r, c)
     except:
         #print("DEBUG: Exception!")
         return ''
 
-def string_to_int(s):
-    
-    return int(float(s))
+class SheetRow:
 
-def process_paths(ods, snp_file, row_index, first_path_col, num_paths, osc_prefix):
+    # one spreadsheet row, held as runs of identical non-empty cells rather than a list of every cell
+    # run i covers columns starts[i] to ends[i] - 1 (1-based) and has the string value values[i]
 
-    # general function to process paths of any of the three types
-    # we pull the actual board path number from PATH_NUM_ROW
+    __slots__ = ('starts', 'ends', 'values')
 
-    # first we find which paths in this cue have any DCA assignment and therefore need to be unmuted
-    mutes = []
-    for path in range(0, num_paths):
-        dca = read_cell_as_string(ods, row_index, path + first_path_col)
-        if dca != '':
-            mutes.append(False)
-        else:
-            mutes.append(True)
-            
-    # then we write out mute-ons for paths which have become muted
-    for path in range(0, num_paths):
-        if mutes[path]:
-            path_num = string_to_int(read_cell_as_string(ods, PATH_NUM_ROW, path + first_path_col))
-            snp_file.write('/' + osc_prefix + '/' + str(path_num).zfill(2) + '/mix/on OFF\n')
-
-    # then we write out the new DCA assignments
-    for path in range(0, num_paths):
-        dca = read_cell_as_string(ods, row_index, path + first_path_col)
-        bitmap = 0
-        if dca != '':
-            bitmap = 1 << (abs(string_to_int(dca)) - 1)
+    def __init__(self):
+        self.starts = array('l')
+        self.ends = array('l')
+        self.values = []
+
+    def add_cells(self, col, repeat, value):
+        if len(self.values) > 0 and self.ends[-1] == col and self.values[-1] == value:
+            self.ends[-1] = col + repeat
         else:
-            bitmap = 0
-        path_num = string_to_int(read_cell_as_string(ods, PATH_NUM_ROW, path + first_path_col))
-        snp_file.write('/' + osc_prefix + '/' + str(path_num).zfill(2) + '/grp/dca ' + str(bitmap) + '\n')
-    
-    # then we write out mute-offs for paths which have become un-muted
-    for path in range(0, num_paths):
-        if not mutes[path]:
-            path_num = string_to_int(read_cell_as_string(ods, PATH_NUM_ROW, path + first_path_col))
-            snp_file.write('/' + osc_prefix + '/' + str(path_num).zfill(2) + '/mix/on ON\n')
-            
-def next_dca_label(ods, row_index, col):
-
-    # function to find the contents of the cell in col 'col' in the next row below 'row_index' that has a valid cue number
-
-    # are we already at the END?
-    search_cue = read_cell_as_string(ods, row_index, CUE_NUM_COL)
-    if search_cue == 'END':
+            self.starts.append(col)
+            self.ends.append(col + repeat)
+            self.values.append(value)
+
+    def cell(self, c):
+        i = bisect_right(self.starts, c) - 1
+        if i >= 0 and c < self.ends[i]:
+            return self.values[i]
         return ''
 
-    # find the next row that has a valid cue
-    search_row = row_index + 1
-    search_cue = read_cell_as_string(ods, search_row, CUE_NUM_COL)
-    while search_cue == '':
-        search_row = search_row + 1
-        search_cue = read_cell_as_string(ods, search_row, CUE_NUM_COL)
+class Sheet:
 
-    # was it the END
-    if search_cue == 'END':
-        return ''
+    # a spreadsheet held as runs of identical non-empty rows, so memory scales with the populated
+    # cells rather than the formatted extent of the sheet (empty rows and cells are never stored)
+    # run i covers rows starts[i] to ends[i] - 1 (1-based) and has the contents rows[i]
+
+    def __init__(self):
+        self.starts = array('l')
+        self.ends = array('l')
+        self.rows = []
+        self.num_rows = 0
 
-    # otherwise return whatever's in the column
-    return read_cell_as_string(ods, search_row, col)
+    def add_rows(self, row_index, repeat, row):
+        self.starts.append(row_index)
+        self.ends.append(row_index + repeat)
+        self.rows.append(row)
+        self.num_rows = row_index + repeat - 1
 
-def current_or_previous_channel_name(ods, row_index, col):
+    def row(self, r):
+        i = bisect_right(self.starts, r) - 1
+        if i >= 0 and r < self.ends[i]:
+            return self.rows[i]
+        return None
 
-    # function to find the contents of the next non-empty cell in col 'col' and row 'row_index' or above
+    def cell(self, r, c):
+        row = self.row(r)
+        if row is None:
+            return ''
+        return row.cell(c)
 
-    # are we already at the top?
-    if row_index <= SKIP_ROWS:
+    def populated_rows(self, first_row):
+
+        # iterate (row index, row) over the non-empty rows from first_row down
+
+        for i in range(bisect_right(self.ends, first_row), len(self.rows)):
+            for row_index in range(max(self.starts[i], first_row), self.ends[i]):
+                yield (row_index, self.rows[i])
+
+def needed_columns(config):
+
+    # the sorted, merged (first, last) ranges of spreadsheet columns the configuration actually uses
+    # everything else is discarded while reading
+
+    ranges = [ ( config.CUE_NUM_COL, config.CUE_NUM_COL ), ( config.CUE_LABEL_COL, config.CUE_LABEL_COL ) ]
+    if config.NUM_DCAS > 0:
+        ranges.append(( config.FIRST_DCA_COL, config.FIRST_DCA_COL + config.NUM_DCAS - 1 ))
+    for (first_path_col, num_paths, osc_prefix) in path_types(config):
+        if num_paths > 0:
+            ranges.append(( first_path_col, first_path_col + num_paths - 1 ))
+    if config.NAME_CHANS and config.NUM_CHANS > 0:
+        ranges.append(( config.FIRST_CHAN_NAME_COL, config.FIRST_CHAN_NAME_COL + config.NUM_CHANS - 1 ))
+    if config.OTHER_MUTES:
+        for col in config.OTHER_MUTES_COLS:
+            ranges.append(( col, col ))
+    ranges.sort()
+    columns = []
+    for (first, last) in ranges:
+        if len(columns) > 0 and first <= columns[-1][1] + 1:
+            columns[-1] = ( columns[-1][0], max(columns[-1][1], last) )
+        else:
+            columns.append(( first, last ))
+    return columns
+
+def project_columns(columns, col, repeat):
+
+    # the parts of the run of cells starting at col which fall within the needed columns,
+    # as a list of (col, repeat) pairs
+
+    parts = []
+    for (first, last) in columns:
+        if first > col + repeat - 1:
+            break
+        start = max(first, col)
+        end = min(last, col + repeat - 1)
+        if start <= end:
+            parts.append(( start, end - start + 1 ))
+    return parts
+
+def sheet_from_rows(rows, columns):
+
+    # build a Sheet from a list of row lists, as returned by pyexcel, keeping only the needed columns
+
+    sheet = Sheet()
+    for r in range(0, len(rows)):
+        row = SheetRow()
+        for (first, last) in columns:
+            for c in range(first - 1, min(last, len(rows[r]))):
+                value = str(rows[r][c])
+                if value != '':
+                    row.add_cells(c + 1, 1, value)
+        if len(row.values) > 0:
+            sheet.add_rows(r + 1, 1, row)
+    return sheet
+
+ODS_OFFICE_NS = 'urn:oasis:names:tc:opendocument:xmlns:office:1.0 '
+ODS_TABLE_NS = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0 '
+ODS_TEXT_NS = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0 '
+
+class OdsSheetReader:
+
+    # streaming reader for a single sheet of an .ods file, or of a flat .fods one, which is the same XML unzipped
+    # content.xml is fed straight out of the zip (or the .fods file) to an incremental expat parser, other sheets are
+    # skipped without building any cell data, and parsing stops once the END cue row has been read
+    # repeated cells are kept as runs in the resulting Sheet, with cell values as the same
+    # strings read_cell_as_string() gives for pyexcel_ods data, except in merged cells: pyexcel_ods
+    # skips the cells a merge covers, shifting everything after them left, but here they still count
+    # as columns (empty ones), so every cell stays in the column it is shown in
+    # rows are numbered as pyexcel_ods numbers them, one per table-row element, so a run of identical
+    # rows saved as one repeated row (usually blank ones) counts as a single row, and SKIP_ROWS and
+    # PATH_NUM_ROW mean the same rows they always have
+    # only cells in the given (first, last) column ranges are converted and kept
+
+    def __init__(self, config, columns):
+        self.config = config
+        self.sheet_name = config.SHEET_NAME
+        self.columns = columns
+        self.sheet = Sheet()
+        self.found_sheet = False
+        self.done = False
+        self.table_depth = 0        # depth of table nesting, counted only inside the wanted sheet
+        self.row_index = 1          # 1-based index of the current row
+        self.row = None
+        self.col = 1                # 1-based index of the current cell
+        self.cell_attrs = None
+        self.cell_repeat = 1
+        self.cell_parts = []        # the parts of the current cell run that are in the needed columns
+        self.paragraphs = []
+        self.text = None
+        self.annotation_depth = 0
+
+    def read(self, ods_file_name):
+        import zipfile
+        if ods_file_name.lower().endswith('.fods'):
+            with open(ods_file_name, 'rb') as content:
+                self.parse(content)
+            return self.sheet
+        with zipfile.ZipFile(ods_file_name) as ods_zip:
+            with ods_zip.open('content.xml') as content:
+                self.parse(content)
+        return self.sheet
+
+    def parse(self, content):
+        parser = expat.ParserCreate(namespace_separator=' ')
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+        while not self.done:
+            chunk = content.read(65536)
+            if not chunk:
+                parser.Parse(b'', True)
+                break
+            parser.Parse(chunk, False)
+
+    def start_element(self, name, attrs):
+        if self.done:
+            return
+        if name == ODS_TABLE_NS + 'table':
+            if self.table_depth > 0:
+                self.table_depth = self.table_depth + 1
+            elif attrs.get(ODS_TABLE_NS + 'name') == self.sheet_name:
+                self.table_depth = 1
+                self.found_sheet = True
+        elif self.table_depth != 1:
+            return
+        elif name == ODS_TABLE_NS + 'table-row':
+            self.row = SheetRow()
+            self.col = 1
+        elif name == ODS_TABLE_NS + 'table-cell' or name == ODS_TABLE_NS + 'covered-table-cell':
+            self.cell_attrs = attrs
+            self.cell_repeat = int(attrs.get(ODS_TABLE_NS + 'number-columns-repeated', '1'))
+            self.cell_parts = project_columns(self.columns, self.col, self.cell_repeat)
+            self.paragraphs = []
+        elif name == ODS_OFFICE_NS + 'annotation':
+            self.annotation_depth = self.annotation_depth + 1
+        elif self.annotation_depth > 0:
+            return
+        elif name == ODS_TEXT_NS + 'p':
+            if len(self.cell_parts) > 0:
+                self.text = []
+        elif self.text is None:
+            return
+        elif name == ODS_TEXT_NS + 's':
+            self.text.append(' ' * int(attrs.get(ODS_TEXT_NS + 'c', '1')))
+        elif name == ODS_TEXT_NS + 'tab':
+            self.text.append('\t')
+        elif name == ODS_TEXT_NS + 'line-break':
+            self.text.append('\n')
+
+    def character_data(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+    def end_element(self, name):
+        if self.done:
+            return
+        if name == ODS_TABLE_NS + 'table':
+            if self.table_depth > 0:
+                self.table_depth = self.table_depth - 1
+                if self.table_depth == 0:
+                    self.done = True
+        elif self.table_depth != 1:
+            return
+        elif name == ODS_TEXT_NS + 'p':
+            if self.text is not None:
+                self.paragraphs.append(''.join(self.text))
+                self.text = None
+        elif name == ODS_OFFICE_NS + 'annotation':
+            self.annotation_depth = self.annotation_depth - 1
+        elif name == ODS_TABLE_NS + 'table-cell' or name == ODS_TABLE_NS + 'covered-table-cell':
+            self.end_cell()
+        elif name == ODS_TABLE_NS + 'table-row':
+            self.end_row()
+
+    def end_cell(self):
+        if len(self.cell_parts) > 0:
+            value = ods_cell_as_string(self.cell_attrs, self.paragraphs)
+            if value != '':
+                for (col, repeat) in self.cell_parts:
+                    self.row.add_cells(col, repeat, value)
+        self.col = self.col + self.cell_repeat
+        self.cell_attrs = None
+
+    def end_row(self):
+        if len(self.row.values) > 0:
+            self.sheet.add_rows(self.row_index, 1, self.row)
+
+            # stop at the END cue
+            if self.row_index > self.config.SKIP_ROWS and self.row.cell(self.config.CUE_NUM_COL) == 'END':
+                self.done = True
+        self.row_index = self.row_index + 1
+        self.row = None
+
+def ods_cell_as_string(attrs, paragraphs):
+
+    # convert a cell to a string in the same way as pyexcel_ods followed by str()
+
+    cell_type = attrs.get(ODS_OFFICE_NS + 'value-type', '')
+    if cell_type == 'float':
+        value = float(attrs.get(ODS_OFFICE_NS + 'value'))
+        if value.is_integer():
+            return str(int(value))
+        return str(value)
+    elif cell_type == 'percentage':
+        return str(float(attrs.get(ODS_OFFICE_NS + 'value')))
+    elif cell_type == 'currency':
+        value = attrs.get(ODS_OFFICE_NS + 'value', '')
+        currency = attrs.get(ODS_OFFICE_NS + 'currency', '')
+        if currency != '':
+            return value + ' ' + currency
+        return value
+    elif cell_type == 'date':
+        value = attrs.get(ODS_OFFICE_NS + 'date-value', '')
+        if len(value) == 10:
+            return value
+        elif len(value) == 19:
+            return value.replace('T', ' ')
+        import datetime
+        return str(datetime.datetime.strptime(value[0:26], '%Y-%m-%dT%H:%M:%S.%f'))
+    elif cell_type == 'time':
+        import datetime
+        import re
+        results = re.match(r'PT(\d+)H(\d+)M(\d+)S', attrs.get(ODS_OFFICE_NS + 'time-value', ''))
+        if results:
+            hours = int(results.group(1))
+            minutes = int(results.group(2))
+            seconds = int(results.group(3))
+            if hours < 24:
+                return str(datetime.time(hours, minutes, seconds))
+            return str(datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds))
         return ''
+    elif cell_type == 'boolean':
+        value = attrs.get(ODS_OFFICE_NS + 'boolean-value', '')
+        if value == 'true':
+            return 'True'
+        elif value == 'false':
+            return 'False'
+        return value
+    return '\n'.join(paragraphs)
 
-    # search upwards to find the previous non-empty cell in this column
-    search_row = row_index
-    search_name = read_cell_as_string(ods, search_row, col)
-    while search_name == '' and search_row > SKIP_ROWS:
-        search_row = search_row - 1
-        search_name = read_cell_as_string(ods, search_row, col)
+def read_ods_sheet(config, ods_file_name):
 
-    # return
-    return search_name
+    # read SHEET_NAME from an .ods or .fods file with the native streaming reader
 
+    import zipfile
+    reader = OdsSheetReader(config, needed_columns(config))
+    try:
+        sheet = reader.read(ods_file_name)
+    except (OSError, zipfile.BadZipFile, KeyError, expat.ExpatError) as e:
+        raise ShowError("Could not read spreadsheet '" + ods_file_name + "': " + str(e))
+    if not reader.found_sheet:
+        raise ShowError("Could not find sheet '" + config.SHEET_NAME + "' in spreadsheet '" + ods_file_name + "'")
+    return sheet
 
-################################################################################
-# Main
-################################################################################    
-        
-if __name__ == "__main__":
+def read_pyexcel_sheet(config, file_name):
 
-    title = '# X32 Snippets v' + VERSION
-    print('#' * len(title))
-    print(title)
-    print('#' * len(title))
-    
-    #
-    # validate command-line parameters
-    #
-    
-    if len(sys.argv) != 3:
-        print("");
-        print("Usage: X32Snippets.py <ods_file_name> <show_name>")
-        sys.exit(0)
-        
-    #
-    # get command line parameters
-    #
+    # read SHEET_NAME from any other kind of spreadsheet with pyexcel, only loading it now
 
-    ods_file_name = sys.argv[1]
-    show_name = sys.argv[2]
+    extension = os.path.splitext(file_name)[1].lower()
+    module_name = config.PYEXCEL_READERS.get(extension, config.PYEXCEL_DEFAULT_READER)
+    try:
+        get_data = importlib.import_module(module_name).get_data
+    except ImportError:
+        raise ShowError("Reading '" + extension + "' spreadsheets needs the " + module_name + " package (pip install " + module_name.replace('_', '-') + ")")
+    try:
+        book = get_data(file_name)
+    except Exception as e:
+        raise ShowError("Could not read spreadsheet '" + file_name + "': " + str(e))
+    if config.SHEET_NAME not in book:
+        raise ShowError("Could not find sheet '" + config.SHEET_NAME + "' in spreadsheet '" + file_name + "'")
+    return sheet_from_rows(book[config.SHEET_NAME], needed_columns(config))
 
-    #
-    # process file
-    #
-    
-    # report
-    print("Opening spreadsheet...")
-    
-    # read the file
-    ods = get_data(ods_file_name)[SHEET_NAME]
-    
-    # init these
-    row_index = SKIP_ROWS
-    snp_index = 0
-    cue_numbers = []
-    cue_labels = []
-    
-    # report
-    print("Creating cues...")
+def read_sheet(config, file_name):
+
+    # read SHEET_NAME from a spreadsheet, natively if it's an .ods or .fods
+
+    if file_name.lower().endswith(( '.ods', '.fods' )):
+        return read_ods_sheet(config, file_name)
+    return read_pyexcel_sheet(config, file_name)
+
+def string_to_int(s):
     
-    # iterate rows until the end
-    for row_index in range(SKIP_ROWS + 1, len(ods)):
-        
+    return int(float(s))
+
+class CueTable:
+
+    # columnar model of the cue rows of the spreadsheet, built in one pass by read_cue_table()
+    # cue numbers, DCA assignments and path numbers are held as compact integer arrays,
+    # cue and DCA labels as interned strings, so no cell is converted or parsed more than once
+
+    def __init__(self):
+        self.num_cues = 0
+        self.rows = array('l')          # spreadsheet row of each cue (1-based)
+        self.cues = []                  # cue number as entered in the spreadsheet
+        self.cue_numbers = array('l')   # cue number * 100 as used in the show file
+        self.labels = []                # cue label
+        self.dca_labels = []            # NUM_DCAS labels per cue, flattened
+        self.next_dca_labels = None     # NUM_DCAS labels of the following cue, flattened (only if needed)
+        self.chan_names = []            # NUM_CHANS carried-forward channel names per cue, flattened (only if NAME_CHANS)
+        self.path_nums = {}             # board path numbers from PATH_NUM_ROW, by OSC prefix
+        self.path_dcas = {}             # signed DCA index per path per cue (0 = unassigned), flattened, by OSC prefix
+        self.other_mutes = array('l')   # channel number per OTHER_MUTES_COLS column per cue (0 = none), flattened
+        self.splits = array('l')        # index of the first cue after each SPLIT_MARKER row
+
+def cell_as_int(s, r, c, what):
+
+    # parse the contents of a numeric cell, returning 0 for an empty cell and giving up on anything else
+
+    if s == '':
+        return 0
+    try:
+        return string_to_int(s)
+    except:
+        raise ShowError("Found invalid " + what + " '" + s + "' at row " + str(r) + ", column " + str(c), row=r, column=c)
+
+def path_types(config):
+
+    # the three types of path, with their spreadsheet columns and OSC prefixes
+
+    return [ ( config.FIRST_CHAN_COL, config.NUM_CHANS, 'ch' ),
+             ( config.FIRST_BUS_COL, config.NUM_BUSES, 'bus' ),
+             ( config.FIRST_AUXIN_COL, config.NUM_AUXINS, 'auxin' ) ]
+
+def read_channel_names(config, row, names):
+
+    # update the current channel names from any non-empty name cells in this row
+
+    for chan in range(0, config.NUM_CHANS):
+        name = row.cell(chan + config.FIRST_CHAN_NAME_COL)
+        if name != '':
+            names[chan] = sys.intern(name)
+
+def read_cue_table(config, ods, log=None):
+
+    # single pass over the spreadsheet rows, extracting everything the snippets need
+
+    if log is None:
+        log = NO_LOG
+    table = CueTable()
+
+    # board path numbers
+    for (first_path_col, num_paths, osc_prefix) in path_types(config):
+        path_nums = array('l')
+        for path in range(0, num_paths):
+            path_num = cell_as_int(read_cell_as_string(ods, config.PATH_NUM_ROW, path + first_path_col), config.PATH_NUM_ROW, path + first_path_col, 'path number')
+            if path_num <= 0:
+                raise ShowError("Found invalid path number at row " + str(config.PATH_NUM_ROW) + ", column " + str(path + first_path_col), row=config.PATH_NUM_ROW, column=path + first_path_col)
+            path_nums.append(path_num)
+        table.path_nums[osc_prefix] = path_nums
+        table.path_dcas[osc_prefix] = array('l')
+
+    # channel names carry forward down the sheet until the next non-empty name cell,
+    # starting from the last skipped row, and including rows with no cue
+    names = [''] * config.NUM_CHANS
+    if config.NAME_CHANS and config.SKIP_ROWS > 0 and ods.row(config.SKIP_ROWS) is not None:
+        read_channel_names(config, ods.row(config.SKIP_ROWS), names)
+
+    # iterate populated rows until the end
+    for (row_index, row) in ods.populated_rows(config.SKIP_ROWS + 1):
+
         # get cue
-        cue = read_cell_as_string(ods, row_index, CUE_NUM_COL)
-        
+        cue = row.cell(config.CUE_NUM_COL)
+
+        # pick up any new channel names
+        if config.NAME_CHANS and cue != 'END':
+            read_channel_names(config, row, names)
+
         # skip rows with no cue
         if cue == '':
-            print("DEBUG: Skipping row " + str(row_index) + " with no cue")
+            if log.wants('debug'):
+                log.debug('skip', "Skipping row " + str(row_index) + " with no cue", row=row_index)
             continue
-            
+
         # the end?
         if cue == 'END':
-            print("DEBUG: Found END, stopping")
+            log.debug('end', "Found END, stopping", row=row_index)
             break
-            
+
+        # a place the show can be split?
+        if cue == config.SPLIT_MARKER:
+            table.splits.append(table.num_cues)
+            continue
+
         # get cue number
-        cue_number = ''
+        cue_number = 0
         try:
             # this could be more robust
             # also does not handle cues of form X.Y.Z or X.Y where Y > 9
-            cue_number = str(int(round(float(cue) * 100.0)))
+            cue_number = int(round(float(cue) * 100.0))
         except:
-            print("ERROR: Found invalid cue number at row " + str(row_index + 1))
-            sys.exit()
-            
-        # get cue label
-        cue_label = read_cell_as_string(ods, row_index, CUE_LABEL_COL)
-        
-        # report snippet
-        print('Generating new cue "' + cue + '", label "' + cue_label + '"')
-            
-        # open snippet file
-        snp_file = open(show_name + '.' + str(snp_index).zfill(3) + '.snp', 'w')
-        
+            raise ShowError("Found invalid cue number at row " + str(row_index), row=row_index)
+
+        # store cue
+        table.rows.append(row_index)
+        table.cues.append(sys.intern(cue))
+        table.cue_numbers.append(cue_number)
+        table.labels.append(sys.intern(row.cell(config.CUE_LABEL_COL)))
+
+        # store path DCA assignments
+        for (first_path_col, num_paths, osc_prefix) in path_types(config):
+            path_dcas = table.path_dcas[osc_prefix]
+            for path in range(0, num_paths):
+                dca_info = row.cell(path + first_path_col)
+                dca = cell_as_int(dca_info, row_index, path + first_path_col, 'DCA number')
+                if dca == 0 and dca_info != '':
+                    raise ShowError("Found invalid DCA number 0 at row " + str(row_index) + ", column " + str(path + first_path_col), row=row_index, column=path + first_path_col)
+                path_dcas.append(dca)
+
+        # store other mutes
+        if config.OTHER_MUTES:
+            for col in config.OTHER_MUTES_COLS:
+                table.other_mutes.append(cell_as_int(row.cell(col), row_index, col, 'channel number'))
+
+        # store DCA labels
+        for dca in range(0, config.NUM_DCAS):
+            table.dca_labels.append(sys.intern(row.cell(dca + config.FIRST_DCA_COL)))
+
+        # store channel names on or above this row
+        if config.NAME_CHANS:
+            table.chan_names.extend(names)
+
+        table.num_cues = table.num_cues + 1
+
+    return table
+
+def read_next_dca_labels(config, table):
+
+    # single backward sweep over the cues, giving each cue the DCA labels of the cue that follows it
+    # the table only holds cue rows, so the next cue is always the next entry, however many blank
+    # or comment rows lie between them in the spreadsheet, and the last cue before END gets none
+
+    table.next_dca_labels = [''] * (table.num_cues * config.NUM_DCAS)
+    next_labels = [''] * config.NUM_DCAS
+    for cue_index in range(table.num_cues - 1, -1, -1):
+        first = cue_index * config.NUM_DCAS
+        table.next_dca_labels[first:first + config.NUM_DCAS] = next_labels
+        next_labels = table.dca_labels[first:first + config.NUM_DCAS]
+
+class SnippetRenderer:
+
+    # renders the snippet for any cue of a cue table as a single string
+    # the snippet is compiled into templates once per table: every path's addresses are worked out from
+    # the path numbers read from PATH_NUM_ROW, and every line that doesn't depend on the cue is built,
+    # up front, so rendering a cue is just picking lines out of lists and joining them once at the end
+
+    def __init__(self, config, table):
+        self.config = config
+        self.table = table
+
+        # for each type of path in use: its OSC prefix, number of paths, and mute-on, DCA assignment and
+        # mute-off lines for each path
+        self.paths = []
+        max_dca = 0
+        for (first_path_col, num_paths, osc_prefix) in path_types(config):
+            if num_paths > 0:
+                addresses = [ '/' + osc_prefix + '/' + str(path_num).zfill(2) for path_num in table.path_nums[osc_prefix] ]
+                self.paths.append(( osc_prefix, len(addresses),
+                                    [ address + '/mix/on OFF\n' for address in addresses ],
+                                    [ address + '/grp/dca ' for address in addresses ],
+                                    [ address + '/mix/on ON\n' for address in addresses ] ))
+                path_dcas = table.path_dcas[osc_prefix]
+                if len(path_dcas) > 0:
+                    max_dca = max(max_dca, max(path_dcas), -min(path_dcas))
+
+        # DCA assignment bitmap for each DCA number (0 = unassigned)
+        self.dca_bitmaps = [ '0\n' ] + [ str(1 << (dca - 1)) + '\n' for dca in range(1, max_dca + 1) ]
+
+        # channel lines
+        chan_addresses = []
+        if config.NUM_CHANS > 0:
+            chan_addresses = [ '/ch/' + str(chan_num).zfill(2) for chan_num in table.path_nums['ch'] ]
+        fx_send = '/mix/' + str(config.FX_UNMUTE_BUS).zfill(2)
+        self.fx_on = [ address + fx_send + ' ON\n' for address in chan_addresses ]
+        self.fx_off = [ address + fx_send + ' OFF\n' for address in chan_addresses ]
+        self.chan_names = [ address + '/config/name "' for address in chan_addresses ]
+
+        # other mutes lines
+        other_chans = range(config.OTHER_MUTES_FIRST_CHAN, config.OTHER_MUTES_FIRST_CHAN + config.OTHER_MUTES_NUM_CHANS)
+        self.other_chans = list(other_chans)
+        self.other_mutes = [ '/ch/' + str(chan).zfill(2) + '/mix/on OFF\n' for chan in other_chans ]
+        self.other_unmutes = [ '/ch/' + str(chan).zfill(2) + '/mix/on ON\n' for chan in other_chans ]
+
+        # DCA label lines
+        dca_addresses = [ '/dca/' + str(dca + 1) + '/config/' for dca in range(0, config.NUM_DCAS) ]
+        self.dca_names = [ address + 'name "' for address in dca_addresses ]
+        self.dca_colors = [ address + 'color ' + config.DCA_COLOR + '\n' for address in dca_addresses ]
+        self.dca_alt_colors = [ address + 'color ' + config.DCA_ALT_LABEL_COLOR + '\n' for address in dca_addresses ]
+        self.dca_same_colors = [ address + 'color ' + config.DCA_SAME_ON_NEXT_CUE_COLOR + '\n' for address in dca_addresses ]
+        self.dca_active_colors = [ address + 'color ' + config.DCA_ACTIVE_ON_NEXT_CUE_COLOR + '\n' for address in dca_addresses ]
+        self.dca_blanks = [ address + 'name ""\n' + address + 'color OFF\n' for address in dca_addresses ]
+        self.dca_alt_labels = set(config.DCA_ALT_LABELS)
+
+    def render(self, cue_index, timings=None):
+
+        # the snippet for one cue
+
+        config = self.config
+        table = self.table
+
         # start snippet
-        snp_file.write('#2.1# "' + cue + '" 0 0 0 0 0\n')
-        
-        # process channels
-        if NUM_CHANS > 0:
-            process_paths(ods, snp_file, row_index, FIRST_CHAN_COL, NUM_CHANS, 'ch')
-        
-        # process buses
-        if NUM_BUSES > 0:
-            process_paths(ods, snp_file, row_index, FIRST_BUS_COL, NUM_BUSES, 'bus')
-        
-        # process auxins
-        if NUM_AUXINS > 0:
-            process_paths(ods, snp_file, row_index, FIRST_AUXIN_COL, NUM_AUXINS, 'auxin')
-        
+        lines = [ '#2.1# "' + table.cues[cue_index] + '" 0 0 0 0 0\n' ]
+
+        # process channels, buses and auxins
+        # paths in this cue with any DCA assignment need to be unmuted, all others muted: first the mute-ons
+        # for paths which have become muted, then the new DCA assignments, then the mute-offs for paths which
+        # have become un-muted
+        dca_bitmaps = self.dca_bitmaps
+        for (osc_prefix, num_paths, mutes, assigns, unmutes) in self.paths:
+            dcas = table.path_dcas[osc_prefix][cue_index * num_paths:(cue_index + 1) * num_paths]
+            lines.extend([ mutes[path] for path in range(0, num_paths) if dcas[path] == 0 ])
+            for path in range(0, num_paths):
+                lines.append(assigns[path])
+                lines.append(dca_bitmaps[abs(dcas[path])])
+            lines.extend([ unmutes[path] for path in range(0, num_paths) if dcas[path] != 0 ])
+
+        if timings is not None:
+            timings.lap('paths')
+
         # for channels only, also control the mute of the given FX bus send for this path
-        if FX_UNMUTE:
-            for chan in range(0, NUM_CHANS):
-                dca = read_cell_as_string(ods, row_index, chan + FIRST_CHAN_COL)
-                fx_on = False
-                if dca != '':
-                    fx_on = string_to_int(dca) < 0
-                chan_num = string_to_int(read_cell_as_string(ods, PATH_NUM_ROW, chan + FIRST_CHAN_COL))
-                if fx_on:
-                    snp_file.write('/ch/' + str(chan_num).zfill(2) + '/mix/' + str(FX_UNMUTE_BUS).zfill(2) + ' ON\n')
-                else:
-                    snp_file.write('/ch/' + str(chan_num).zfill(2) + '/mix/' + str(FX_UNMUTE_BUS).zfill(2) + ' OFF\n')
-        
+        if config.FX_UNMUTE:
+            num_chans = len(self.fx_on)
+            chan_dcas = table.path_dcas['ch'][cue_index * num_chans:(cue_index + 1) * num_chans]
+            lines.extend([ self.fx_on[chan] if chan_dcas[chan] < 0 else self.fx_off[chan] for chan in range(0, num_chans) ])
+            if timings is not None:
+                timings.lap('FX_UNMUTE')
+
         # for channels only, set name from additional spreadsheet data
-        if NAME_CHANS:
-            for chan in range(0, NUM_CHANS):
-                name_on_or_above = current_or_previous_channel_name(ods, row_index, chan + FIRST_CHAN_NAME_COL)
-                chan_num = string_to_int(read_cell_as_string(ods, PATH_NUM_ROW, chan + FIRST_CHAN_COL))
-                if name_on_or_above != '':
-                    snp_file.write('/ch/' + str(chan_num).zfill(2) + '/config/name "' + name_on_or_above + '"\n')
-        
+        if config.NAME_CHANS:
+            num_chans = len(self.chan_names)
+            names = table.chan_names[cue_index * num_chans:(cue_index + 1) * num_chans]
+            lines.extend([ self.chan_names[chan] + names[chan] + '"\n' for chan in range(0, num_chans) if names[chan] != '' ])
+            if timings is not None:
+                timings.lap('NAME_CHANS')
+
         # mute specified channels in range
-        if OTHER_MUTES:
-            for chan in range(0, OTHER_MUTES_NUM_CHANS):
-                mute_this_chan = False
-                for col in OTHER_MUTES_COLS:
-                    mute_info = read_cell_as_string(ods, row_index, col)
-                    if mute_info != '':
-                        mute_chan = string_to_int(mute_info)
-                        if mute_chan == chan + OTHER_MUTES_FIRST_CHAN:
-                            mute_this_chan = True
-                if mute_this_chan:
-                    snp_file.write('/ch/' + str(chan + OTHER_MUTES_FIRST_CHAN).zfill(2) + '/mix/on OFF\n')
+        if config.OTHER_MUTES:
+            num_cols = len(config.OTHER_MUTES_COLS)
+            mute_chans = table.other_mutes[cue_index * num_cols:(cue_index + 1) * num_cols]
+            for chan in range(0, len(self.other_chans)):
+                if self.other_chans[chan] in mute_chans:
+                    lines.append(self.other_mutes[chan])
                 else:
-                    snp_file.write('/ch/' + str(chan + OTHER_MUTES_FIRST_CHAN).zfill(2) + '/mix/on ON\n')
-        
-        # finally we write out the new DCA labels
-        for dca in range(0, NUM_DCAS):
-            label = read_cell_as_string(ods, row_index, dca + FIRST_DCA_COL)
-            next_label = next_dca_label(ods, row_index, dca + FIRST_DCA_COL)
+                    lines.append(self.other_unmutes[chan])
+            if timings is not None:
+                timings.lap('OTHER_MUTES')
+
+        # finally the new DCA labels
+        num_dcas = config.NUM_DCAS
+        labels = table.dca_labels[cue_index * num_dcas:(cue_index + 1) * num_dcas]
+        next_labels = [ '' ] * num_dcas
+        if table.next_dca_labels is not None:
+            next_labels = table.next_dca_labels[cue_index * num_dcas:(cue_index + 1) * num_dcas]
+        for dca in range(0, num_dcas):
+            label = labels[dca]
             if label != '':
-                snp_file.write('/dca/' + str(dca + 1) + '/config/name "' + label + '"\n')
-                if DCA_ALT_LABEL_COLORS and label in DCA_ALT_LABELS:
-                    snp_file.write('/dca/' + str(dca + 1) + '/config/color ' + DCA_ALT_LABEL_COLOR + '\n')
-                elif DCA_SAME_ON_NEXT_CUE and label == next_label:
-                    snp_file.write('/dca/' + str(dca + 1) + '/config/color ' + DCA_SAME_ON_NEXT_CUE_COLOR + '\n')
+                lines.append(self.dca_names[dca] + label + '"\n')
+                if config.DCA_ALT_LABEL_COLORS and label in self.dca_alt_labels:
+                    lines.append(self.dca_alt_colors[dca])
+                elif config.DCA_SAME_ON_NEXT_CUE and label == next_labels[dca]:
+                    lines.append(self.dca_same_colors[dca])
                 else:
-                    snp_file.write('/dca/' + str(dca + 1) + '/config/color ' + DCA_COLOR + '\n')
-            elif DCA_ACTIVE_ON_NEXT_CUE and next_label != '':
-                snp_file.write('/dca/' + str(dca + 1) + '/config/name "' + next_label + '"\n')
-                snp_file.write('/dca/' + str(dca + 1) + '/config/color ' + DCA_ACTIVE_ON_NEXT_CUE_COLOR + '\n')
+                    lines.append(self.dca_colors[dca])
+            elif config.DCA_ACTIVE_ON_NEXT_CUE and next_labels[dca] != '':
+                lines.append(self.dca_names[dca] + next_labels[dca] + '"\n')
+                lines.append(self.dca_active_colors[dca])
             else:
-                snp_file.write('/dca/' + str(dca + 1) + '/config/name ""\n')
-                snp_file.write('/dca/' + str(dca + 1) + '/config/color OFF\n')
+                lines.append(self.dca_blanks[dca])
+        if timings is not None:
+            timings.lap('DCA labels')
+
+        return ''.join(lines)
+
+def slice_cue_table(config, table, first_cue, end_cue):
+
+    # a cue table of just cues first_cue to end_cue - 1, to send to another process to render
+
+    chunk = CueTable()
+    chunk.num_cues = end_cue - first_cue
+    chunk.rows = table.rows[first_cue:end_cue]
+    chunk.cues = table.cues[first_cue:end_cue]
+    chunk.cue_numbers = table.cue_numbers[first_cue:end_cue]
+    chunk.labels = table.labels[first_cue:end_cue]
+    chunk.dca_labels = table.dca_labels[first_cue * config.NUM_DCAS:end_cue * config.NUM_DCAS]
+    if table.next_dca_labels is not None:
+        chunk.next_dca_labels = table.next_dca_labels[first_cue * config.NUM_DCAS:end_cue * config.NUM_DCAS]
+    if config.NAME_CHANS:
+        chunk.chan_names = table.chan_names[first_cue * config.NUM_CHANS:end_cue * config.NUM_CHANS]
+    chunk.path_nums = table.path_nums
+    for osc_prefix in table.path_dcas:
+        num_paths = len(table.path_nums[osc_prefix])
+        chunk.path_dcas[osc_prefix] = table.path_dcas[osc_prefix][first_cue * num_paths:end_cue * num_paths]
+    if config.OTHER_MUTES:
+        num_cols = len(config.OTHER_MUTES_COLS)
+        chunk.other_mutes = table.other_mutes[first_cue * num_cols:end_cue * num_cols]
+    return chunk
+
+def render_snippets(config, table, cue_indexes):
+
+    # the full snippet text for each of the cues, in a pool worker
+
+    renderer = SnippetRenderer(config, table)
+    return [ renderer.render(cue_index) for cue_index in cue_indexes ]
+
+def render_snippets_parallel(config, table, cue_indexes):
+
+    # the full snippet text for each of the cues, by cue index, rendered in chunks across a process pool
+    # each chunk is sent just the slice of the cue table it covers
+
+    import concurrent.futures
+    rendered = {}
+    with concurrent.futures.ProcessPoolExecutor() as pool:
+        futures = []
+        for chunk_first in range(0, len(cue_indexes), config.PARALLEL_CHUNK_CUES):
+            chunk_indexes = cue_indexes[chunk_first:chunk_first + config.PARALLEL_CHUNK_CUES]
+            first_cue = chunk_indexes[0]
+            chunk = slice_cue_table(config, table, first_cue, chunk_indexes[-1] + 1)
+            futures.append(( chunk_indexes, pool.submit(render_snippets, config, chunk, [ cue_index - first_cue for cue_index in chunk_indexes ]) ))
+        for (chunk_indexes, future) in futures:
+            texts = future.result()
+            for index in range(0, len(chunk_indexes)):
+                rendered[chunk_indexes[index]] = texts[index]
+    return rendered
+
+def is_keyframe(config, cue_index):
+
+    # should this cue's snippet carry the full console state, rather than just the changes?
+
+    if config.DELTA_KEYFRAME_INTERVAL > 0:
+        return cue_index % config.DELTA_KEYFRAME_INTERVAL == 0
+    return cue_index == 0
+
+def delta_snippet(text, state, keyframe):
+
+    # reduce a full snippet to the commands that change the console state left by the previous cues,
+    # keeping their order, and update that state
+    # a keyframe keeps every command, so it is safe to jump straight to
+
+    lines = text.splitlines(True)
+    delta = [ lines[0] ]
+    for line in lines[1:]:
+        (address, value) = line.rstrip('\n').split(' ', 1)
+        if keyframe or state.get(address) != value:
+            delta.append(line)
+            state[address] = value
+    return ''.join(delta)
+
+def snippet_file_name(show_name, snp_index):
+
+    return show_name + '.' + str(snp_index).zfill(3) + '.snp'
+
+def write_show(table, shw_file, show_name, first_cue, cue_snippets, snippet_cues):
+
+    # write out the show file referencing all the snippets, for the cues from first_cue on
+    # each cue recalls snippet cue_snippets[cue], and each snippet is named after the first cue that uses it
+
+    # start show
+    shw_file.write('#2.6#\n')
+    shw_file.write('show "' + show_name +'" 0 0 0 0 0 0 0 0 0 0 "X32-Edit 3.00"\n')
+    
+    # write cues
+    for show_cue in range(0, len(cue_snippets)):
+        cue_index = first_cue + show_cue
+        shw_file.write('cue/' + str(show_cue).zfill(3) + ' ' + str(table.cue_numbers[cue_index]) + ' "' + table.labels[cue_index] + '" 0 -1 ' + str(cue_snippets[show_cue]) + ' 0 1 0 0\n')
+    
+    # write snippet refs
+    for snp_index in range(0, len(snippet_cues)):
+        shw_file.write('snippet/' + str(snp_index).zfill(3) + ' "' + table.labels[snippet_cues[snp_index]] + '" 0 0 0 0 1\n')
+
+def config_hash(config):
+
+    # hash of everything other than the cue rows that affects the output
+    # (not the settings for output, reading, parallelism, watching or live mode, so --verbose doesn't force a rebuild)
+
+    settings = []
+    for name in sorted(CONFIG_NAMES):
+        if not name.startswith(( 'LOG_', 'PYEXCEL_', 'PARALLEL_', 'WATCH_', 'LIVE_' )):
+            settings.append(name + '=' + repr(getattr(config, name)))
+    import hashlib
+    return hashlib.sha1('\n'.join(settings).encode('utf-8')).hexdigest()
+
+def cue_inputs_hash(config, table, cue_index):
+
+    # hash of everything in the cue table that the snippet for this cue is generated from,
+    # including the next cue's DCA labels if they are looked ahead to
+
+    inputs = [ table.cues[cue_index], table.labels[cue_index] ]
+    for (first_path_col, num_paths, osc_prefix) in path_types(config):
+        inputs.append(table.path_nums[osc_prefix].tolist())
+        inputs.append(table.path_dcas[osc_prefix][cue_index * num_paths:(cue_index + 1) * num_paths].tolist())
+    if config.NAME_CHANS:
+        inputs.append(table.chan_names[cue_index * config.NUM_CHANS:(cue_index + 1) * config.NUM_CHANS])
+    if config.OTHER_MUTES:
+        num_cols = len(config.OTHER_MUTES_COLS)
+        inputs.append(table.other_mutes[cue_index * num_cols:(cue_index + 1) * num_cols].tolist())
+    inputs.append(table.dca_labels[cue_index * config.NUM_DCAS:(cue_index + 1) * config.NUM_DCAS])
+    if table.next_dca_labels is not None:
+        inputs.append(table.next_dca_labels[cue_index * config.NUM_DCAS:(cue_index + 1) * config.NUM_DCAS])
+    import hashlib
+    return hashlib.sha1(repr(inputs).encode('utf-8')).hexdigest()
+
+def text_hash(text):
+
+    import hashlib
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def read_manifest(manifest_file_name):
+
+    # the manifest records what the previous run generated, so unchanged files need not be rewritten
+    # a missing or unreadable manifest just means everything gets rebuilt
+
+    import json
+    empty_manifest = { 'version': VERSION, 'config': '', 'cues': [], 'snippets': [], 'show': '' }
+    try:
+        with open(manifest_file_name, 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+        for key in empty_manifest:
+            if type(manifest[key]) != type(empty_manifest[key]):
+                return empty_manifest
+        if manifest['version'] == VERSION:
+            return manifest
+    except:
+        pass
+    return empty_manifest
+
+def write_if_changed(file_name, text, old_hash):
+
+    # write the file unless it is already there with the same contents,
+    # returning the new hash and whether it was written
+
+    new_hash = text_hash(text)
+    if new_hash != old_hash or not os.path.exists(file_name):
+        with open(file_name, 'w') as out_file:
+            out_file.write(text)
+        return (new_hash, True)
+    return (new_hash, False)
+
+class Timings:
+
+    # wall time and memory allocated per stage of a build, for --timings
+    # each call to lap() charges everything since the previous call to the named stage,
+    # so the stages add up to the whole build
+    # with snapshots, it also keeps a tracemalloc snapshot from close to the peak, for --profile
+
+    def __init__(self, snapshots=False):
+        import tracemalloc
+        self.stages = []                # stage names, in the order first seen
+        self.times = {}
+        self.allocated = {}             # net change in traced memory
+        self.calls = {}
+        self.snapshots = snapshots
+        self.snapshot = None
+        self.snapshot_memory = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.last_time = time.perf_counter()
+        self.last_memory = tracemalloc.get_traced_memory()[0]
+
+    def lap(self, stage):
+        import tracemalloc
+        now = time.perf_counter()
+        memory = tracemalloc.get_traced_memory()[0]
+        if stage not in self.times:
+            self.stages.append(stage)
+            self.times[stage] = 0.0
+            self.allocated[stage] = 0
+            self.calls[stage] = 0
+        self.times[stage] = self.times[stage] + now - self.last_time
+        self.allocated[stage] = self.allocated[stage] + memory - self.last_memory
+        self.calls[stage] = self.calls[stage] + 1
+        if self.snapshots and memory > self.snapshot_memory * 1.1:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_memory = memory
+        self.last_time = time.perf_counter()
+        self.last_memory = memory
+
+    def report(self, log):
+        import tracemalloc
+        total = sum(self.times.values())
+        if log.mode == 'json':
+            stages = {}
+            for stage in self.stages:
+                stages[stage] = { 'calls': self.calls[stage], 'ms': self.times[stage] * 1000.0, 'allocated': self.allocated[stage] }
+            log.summary('timings', 'Timings', stages=stages, ms=total * 1000.0, peak=tracemalloc.get_traced_memory()[1])
+            return
+        print('Timings (with memory tracing on, so slower than usual):')
+        print('    %-20s %8s %10s %6s %14s' % ('stage', 'calls', 'time (ms)', '%', 'allocated (MB)'))
+        for stage in self.stages:
+            print('    %-20s %8d %10.1f %6.1f %14.2f' % (stage, self.calls[stage], self.times[stage] * 1000.0, self.times[stage] * 100.0 / max(total, 1e-9), self.allocated[stage] / 1048576.0))
+        print('    %-20s %8s %10.1f %6.1f %14.2f peak' % ('total', '', total * 1000.0, 100.0, tracemalloc.get_traced_memory()[1] / 1048576.0))
+
+def write_profile_report(report_file_name, profiler, timings):
+
+    # write the cProfile results and the biggest allocations at the peak to a text file, for --profile
+
+    import pstats
+    with open(report_file_name, 'w') as report_file:
+        report_file.write('cProfile, by cumulative time\n\n')
+        pstats.Stats(profiler, stream=report_file).sort_stats('cumulative').print_stats(50)
+        if timings.snapshot is not None:
+            report_file.write('\ntracemalloc, biggest allocations at the peak (' + '%.2f' % (timings.snapshot_memory / 1048576.0) + 'MB), by line\n\n')
+            for stat in timings.snapshot.statistics('lineno')[:30]:
+                report_file.write(str(stat) + '\n')
+
+def build_cue_table(config, sheet, timings=None, log=None):
+
+    # parse the sheet once into a cue table, with the next cue's DCA labels if a feature needs them
+
+    table = read_cue_table(config, sheet, log)
+    if timings is not None:
+        timings.lap('cue parsing')
+    
+    # only look ahead to the next cue if a feature needs it
+    if config.DCA_ACTIVE_ON_NEXT_CUE or config.DCA_SAME_ON_NEXT_CUE:
+        read_next_dca_labels(config, table)
+        if timings is not None:
+            timings.lap('next cue lookahead')
+
+    return table
+
+def read_show_table(config, ods_file_name, timings=None, log=None):
+
+    # read the spreadsheet into a cue table
+
+    if log is None:
+        log = NO_LOG
+
+    # report
+    log.info('open', "Opening spreadsheet...", file=ods_file_name)
+    
+    # read the file
+    ods = read_sheet(config, ods_file_name)
+    if timings is not None:
+        timings.lap('spreadsheet load')
+    
+    # report
+    log.info('read', "Reading cues...")
+
+    return build_cue_table(config, ods, timings, log)
+
+def generate_show_files(config, ods_file_name, show_name, timings=None, parallel=True, log=None):
+
+    # read the spreadsheet and (re)generate the snippet and show files
+    # the parts of a split show are built in parallel unless timing, or told not to, or each part's
+    # snippets are being rendered in parallel anyway
+
+    if log is None:
+        log = NO_LOG
+    table = read_show_table(config, ods_file_name, timings, log)
+
+    # split the show up if it's too big for the console
+    parts = split_show(config, table)
+    names = part_names(show_name, parts)
+    if len(parts) == 1:
+        generate_part(config, table, show_name, 0, table.num_cues, timings, log)
+    else:
+        log.summary('split', 'Show has ' + str(table.num_cues) + ' cues, too many for one console show, splitting into ' + str(len(parts)) + ' shows...', cues=table.num_cues, shows=len(parts))
+        for part in range(0, len(parts)):
+            log.info('part', 'Show "' + names[part] + '" has cues "' + table.cues[parts[part][0]] + '" to "' + table.cues[parts[part][1] - 1] + '"', show=names[part], first_cue=table.cues[parts[part][0]], last_cue=table.cues[parts[part][1] - 1])
+        log.flush()
+        if timings is not None or not parallel or config.PARALLEL_RENDER:
+            # one after the other in this process, so all the time is accounted for
+            for part in range(0, len(parts)):
+                generate_part(config, table, names[part], parts[part][0], parts[part][1], timings, log)
+            return
+        import concurrent.futures
+        with concurrent.futures.ProcessPoolExecutor() as pool:
+            futures = []
+            for part in range(0, len(parts)):
+                futures.append(pool.submit(generate_part, config, table, names[part], parts[part][0], parts[part][1], None, log))
+            for future in futures:
+                future.result()
+
+def split_show(config, table):
+
+    # partition the cues into (first, end) ranges that each fit on the console as one show,
+    # packing as many whole sections between SPLIT_MARKER rows into each as will fit,
+    # and only splitting a section where it is too big by itself
+    # (every cue is assumed to need its own snippet, even if it might end up shared)
+
+    max_cues = min(config.MAX_SHOW_CUES, config.MAX_SHOW_SNIPPETS)
+    if table.num_cues <= max_cues:
+        return [ ( 0, table.num_cues ) ]
+    starts = [ 0 ]
+    for split in table.splits:
+        if split > starts[-1] and split < table.num_cues:
+            starts.append(split)
+    starts.append(table.num_cues)
+    parts = []
+    part_first = 0
+    for section in range(1, len(starts)):
+        section_first = starts[section - 1]
+        section_end = starts[section]
+        if section_end - part_first > max_cues and section_first > part_first:
+            parts.append(( part_first, section_first ))
+            part_first = section_first
+        while section_end - part_first > max_cues:
+            parts.append(( part_first, part_first + max_cues ))
+            part_first = part_first + max_cues
+    parts.append(( part_first, table.num_cues ))
+    return parts
+
+def part_names(show_name, parts):
+
+    # the name of each console show: the show name itself, or numbered from _1 if it was split
+
+    if len(parts) == 1:
+        return [ show_name ]
+    return [ show_name + '_' + str(part + 1) for part in range(0, len(parts)) ]
+
+class ShowPart:
+
+    # the files of one console show, built in memory by build_part()
+    # snippets holds the text of each snippet, or None for one left unchanged on disk from the last run
+
+    def __init__(self, name, first_cue, end_cue):
+        self.name = name
+        self.first_cue = first_cue
+        self.end_cue = end_cue
+        self.cue_status = []        # 'generated', 'unchanged' or 'shared' for each cue
+        self.cue_snippets = []      # snippet recalled by each cue
+        self.cue_inputs = []        # cue_inputs_hash() of each cue (only when built against a manifest)
+        self.snippet_cues = []      # first cue using each snippet
+        self.snippets = []
+        self.show = ''              # text of the show file
+
+    def files(self):
+
+        # (file name, text) for every file, snippets first
+
+        files = []
+        for snp_index in range(0, len(self.snippets)):
+            files.append(( snippet_file_name(self.name, snp_index), self.snippets[snp_index] ))
+        files.append(( self.name + '.shw', self.show ))
+        return files
+
+class Show:
+
+    # a whole show built in memory by build_show(): its cue table, and one ShowPart per console show
+
+    def __init__(self, name, table, parts):
+        self.name = name
+        self.table = table
+        self.parts = parts
+
+    def files(self):
+        files = []
+        for part in self.parts:
+            files.extend(part.files())
+        return files
+
+    def write(self, directory='.'):
+
+        # write every file into the directory
+
+        for (file_name, text) in self.files():
+            with open(os.path.join(directory, file_name), 'w') as out_file:
+                out_file.write(text)
+
+def build_part(config, table, show_name, first_cue, end_cue, old_manifest=None, timings=None, parallel=False):
+
+    # build the snippets and show file for cues first_cue to end_cue - 1 as one show, in memory
+    # given the manifest of the last run, cues whose inputs haven't changed are not rebuilt,
+    # as long as their snippet files are still there
+    # in parallel, the snippets are rendered across a process pool first, then put together in order,
+    # so the result is exactly the same
+
+    part = ShowPart(show_name, first_cue, end_cue)
+    
+    # the old snippets can only be kept if they were built the same way
+    # (delta snippets also depend on every cue before, and shared snippets on every other cue, so those
+    # always get regenerated, although not always rewritten)
+    reuse = old_manifest is not None and not config.DELTA_SNIPPETS and not config.DEDUPE_SNIPPETS and old_manifest['config'] == config_hash(config)
+    
+    # what did we generate last time?
+    # (when the old snippets can be kept, every cue has its own, so cue and snippet numbers match)
+    keep = [ False ] * (end_cue - first_cue)
+    if old_manifest is not None:
+        for cue_index in range(first_cue, end_cue):
+            inputs = cue_inputs_hash(config, table, cue_index)
+            part.cue_inputs.append(inputs)
+            snp_index = cue_index - first_cue
+            if reuse and snp_index < len(old_manifest['cues']) and old_manifest['cues'][snp_index] == inputs:
+                keep[snp_index] = snp_index < len(old_manifest['snippets']) and os.path.exists(snippet_file_name(show_name, snp_index))
+        if timings is not None:
+            timings.lap('manifest')
+    
+    # render everything else at once, if rendering in parallel
+    renderer = SnippetRenderer(config, table)
+    rendered = {}
+    cue_indexes = [ cue_index for cue_index in range(first_cue, end_cue) if not keep[cue_index - first_cue] ]
+    if parallel and len(cue_indexes) > 0:
+        rendered = render_snippets_parallel(config, table, cue_indexes)
+    
+    # console state left by the cues so far, for delta snippets
+    state = {}
+    
+    # snippet for each unique body
+    body_snippets = {}
+    
+    # iterate cues
+    for cue_index in range(first_cue, end_cue):
         
-        # close snippet file
-        snp_file.close()
+        # skip it if nothing changed
+        if keep[cue_index - first_cue]:
+            part.cue_snippets.append(len(part.snippets))
+            part.snippet_cues.append(cue_index)
+            part.snippets.append(None)
+            part.cue_status.append('unchanged')
+            continue
         
-        # store
-        cue_numbers.append(cue_number)
-        cue_labels.append(cue_label)
+        # generate snippet
+        if cue_index in rendered:
+            snp_text = rendered[cue_index]
+        else:
+            snp_text = renderer.render(cue_index, timings)
         
-        # next
-        snp_index = snp_index + 1
+        # reduce it to what has changed since the previous cue
+        if config.DELTA_SNIPPETS:
+            snp_text = delta_snippet(snp_text, state, is_keyframe(config, cue_index - first_cue))
+            if timings is not None:
+                timings.lap('DELTA_SNIPPETS')
+        
+        # share the snippet of an earlier cue with exactly the same commands
+        if config.DEDUPE_SNIPPETS:
+            body_hash = text_hash(snp_text[snp_text.index('\n') + 1:])
+            if timings is not None:
+                timings.lap('DEDUPE_SNIPPETS')
+            if body_hash in body_snippets:
+                part.cue_snippets.append(body_snippets[body_hash])
+                part.cue_status.append('shared')
+                continue
+            body_snippets[body_hash] = len(part.snippets)
+        
+        # keep it
+        part.cue_snippets.append(len(part.snippets))
+        part.snippet_cues.append(cue_index)
+        part.snippets.append(snp_text)
+        part.cue_status.append('generated')
+    
+    # generate show
+    shw_file = io.StringIO()
+    write_show(table, shw_file, show_name, first_cue, part.cue_snippets, part.snippet_cues)
+    part.show = shw_file.getvalue()
+    if timings is not None:
+        timings.lap('show file')
+    
+    return part
+
+def build_show(config, sheet, show_name, log=None):
+
+    # build a whole show in memory from a sheet read by read_sheet(), without writing anything,
+    # splitting it into several console shows if it's too big for one
+
+    table = build_cue_table(config, sheet, None, log)
+    parts = split_show(config, table)
+    names = part_names(show_name, parts)
+    return Show(show_name, table, [ build_part(config, table, names[part], parts[part][0], parts[part][1], parallel=config.PARALLEL_RENDER) for part in range(0, len(parts)) ])
+
+def generate_part(config, table, show_name, first_cue, end_cue, timings=None, log=None):
+
+    # (re)generate the snippet and show files for cues first_cue to end_cue - 1 as one show
+    # with PARALLEL_RENDER (and not timing), the snippets are rendered across a process pool,
+    # and written out by a pool of threads
+
+    if log is None:
+        log = NO_LOG
+
+    # report
+    log.info('create', "Creating cues...", show=show_name)
+    
+    # only regenerate and rewrite what has changed since the last run
+    manifest_file_name = show_name + '.manifest'
+    old_manifest = read_manifest(manifest_file_name)
+    if timings is not None:
+        timings.lap('manifest')
+    parallel = config.PARALLEL_RENDER and timings is None
+    part = build_part(config, table, show_name, first_cue, end_cue, old_manifest, timings, parallel)
+    manifest = { 'version': VERSION, 'config': config_hash(config), 'cues': part.cue_inputs, 'snippets': [], 'show': '' }
+    
+    # write out the new snippets if different
+    new_snippets = [ snp_index for snp_index in range(0, len(part.snippets)) if part.snippets[snp_index] is not None ]
+    file_names = [ snippet_file_name(show_name, snp_index) for snp_index in new_snippets ]
+    texts = [ part.snippets[snp_index] for snp_index in new_snippets ]
+    old_hashes = [ '' ] * len(new_snippets)
+    for index in range(0, len(new_snippets)):
+        if new_snippets[index] < len(old_manifest['snippets']):
+            old_hashes[index] = old_manifest['snippets'][new_snippets[index]]
+    if parallel and len(new_snippets) > 1:
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor(config.PARALLEL_WRITE_THREADS) as pool:
+            results = list(pool.map(write_if_changed, file_names, texts, old_hashes))
+    else:
+        results = list(map(write_if_changed, file_names, texts, old_hashes))
+    if timings is not None:
+        timings.lap('snippet writes')
+    
+    # the new hash and whether it was written for each snippet, or the old hash for one left alone
+    snippet_written = [ False ] * len(part.snippets)
+    manifest['snippets'] = [ '' ] * len(part.snippets)
+    for snp_index in range(0, len(part.snippets)):
+        if part.snippets[snp_index] is None:
+            manifest['snippets'][snp_index] = old_manifest['snippets'][snp_index]
+    for index in range(0, len(new_snippets)):
+        (manifest['snippets'][new_snippets[index]], snippet_written[new_snippets[index]]) = results[index]
+    
+    # counts for the summary
+    counts = { 'generated': 0, 'unchanged': 0, 'shared': 0, 'files_written': 0, 'bytes_written': 0 }
+    
+    # report each cue
+    for cue_index in range(first_cue, end_cue):
+        
+        # get cue, label, snippet and what happened to it
+        cue = table.cues[cue_index]
+        cue_label = table.labels[cue_index]
+        snp_index = part.cue_snippets[cue_index - first_cue]
+        status = part.cue_status[cue_index - first_cue]
+        counts[status] = counts[status] + 1
+        
+        if status == 'unchanged':
+            if log.wants('info'):
+                log.info('cue', 'Unchanged cue "' + cue + '", label "' + cue_label + '"', cue=cue, label=cue_label, status='unchanged', snippet=snp_index)
+        elif status == 'shared':
+            if log.wants('info'):
+                log.info('cue', 'Sharing snippet ' + str(snp_index) + ' for cue "' + cue + '"', cue=cue, label=cue_label, status='shared', snippet=snp_index)
+        else:
+            snp_text = part.snippets[snp_index]
+            bytes_written = 0
+            if snippet_written[snp_index]:
+                bytes_written = len(snp_text.encode('utf-8'))
+                counts['files_written'] = counts['files_written'] + 1
+                counts['bytes_written'] = counts['bytes_written'] + bytes_written
+            if log.wants('info'):
+                log.info('cue', 'Generating new cue "' + cue + '", label "' + cue_label + '"', cue=cue, label=cue_label, status='generated', snippet=snp_index,
+                    commands=snp_text.count('\n') - 1, bytes_written=bytes_written)
+    if timings is not None:
+        timings.lap('progress output')
     
     #
-    # generate show file
+    # write show file
     #
     
     # report
-    print('Creating show file...')
+    log.info('show', 'Creating show file...', show=show_name)
     
-    # open show file
-    shw_file = open(show_name + '.shw', 'w')
+    # write it out if different
+    (manifest['show'], written) = write_if_changed(show_name + '.shw', part.show, old_manifest['show'])
+    if written:
+        counts['files_written'] = counts['files_written'] + 1
+        counts['bytes_written'] = counts['bytes_written'] + len(part.show.encode('utf-8'))
+    if timings is not None:
+        timings.lap('show file')
     
-    # start show
-    shw_file.write('#2.6#\n')
-    shw_file.write('show "' + show_name +'" 0 0 0 0 0 0 0 0 0 0 "X32-Edit 3.00"\n')
+    # remember what we did
+    import json
+    with open(manifest_file_name, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=1)
+    if timings is not None:
+        timings.lap('manifest')
     
+    # summarise
+    log.summary('built', 'Show "' + show_name + '": ' + str(end_cue - first_cue) + ' cues, ' + str(len(part.snippet_cues)) + ' snippets (' + str(counts['generated']) + ' generated, ' + str(counts['unchanged']) + ' unchanged, ' + str(counts['shared']) + ' shared), ' + str(counts['files_written']) + ' files written',
+        show=show_name, cues=end_cue - first_cue, snippets=len(part.snippet_cues), **counts)
+    log.flush()
+
+class FileWatcher:
+
+    # waits for a file to be saved
+    # on Linux this uses inotify on the containing directory, as LibreOffice saves by writing a temp file
+    # and renaming it over the original, elsewhere it polls the file's size and modification time
+    # either way, it only returns once the file has stopped changing for WATCH_DEBOUNCE seconds
+
+    def __init__(self, config, file_name):
+        self.config = config
+        self.file_name = os.path.abspath(file_name)
+        self.inotify_fd = -1
+        self.last_stat = self.stat()
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init()
+            if fd >= 0:
+                mask = INOTIFY_CLOSE_WRITE | INOTIFY_MOVED_TO | INOTIFY_CREATE
+                if libc.inotify_add_watch(fd, os.path.dirname(self.file_name).encode('utf-8'), mask) >= 0:
+                    self.inotify_fd = fd
+                else:
+                    os.close(fd)
+        except:
+            pass
+
+    def stat(self):
+        try:
+            st = os.stat(self.file_name)
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            return None
+
+    def changed(self, timeout):
+
+        # has the file been touched within the timeout?
+
+        if self.inotify_fd < 0:
+            time.sleep(timeout)
+            new_stat = self.stat()
+            if new_stat == self.last_stat:
+                return False
+            self.last_stat = new_stat
+            return True
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            ready = select.select([ self.inotify_fd ], [], [], remaining)[0]
+            if len(ready) == 0:
+                return False
+            data = os.read(self.inotify_fd, 65536)
+            touched = False
+            offset = 0
+            while offset < len(data):
+                (wd, mask, cookie, length) = struct.unpack_from('iIII', data, offset)
+                name = data[offset + 16:offset + 16 + length].rstrip(b'\0').decode('utf-8', 'replace')
+                if name == os.path.basename(self.file_name):
+                    touched = True
+                offset = offset + 16 + length
+            if touched:
+                return True
+
+    def wait(self):
+        while True:
+            if self.inotify_fd >= 0:
+                touched = self.changed(3600.0)
+            else:
+                touched = self.changed(self.config.WATCH_POLL_INTERVAL)
+            if not touched:
+                continue
+
+            # let the save settle
+            while self.changed(self.config.WATCH_DEBOUNCE):
+                pass
+            self.last_stat = self.stat()
+            if self.last_stat is not None:
+                return
+
+def watch_and_regenerate(config, ods_file_name, show_name, log):
+
+    # regenerate the show every time the spreadsheet is saved, until interrupted
+    # everything stays loaded between saves, and the manifest means only changed cues are rewritten
+
+    watcher = FileWatcher(config, ods_file_name)
+    if watcher.inotify_fd >= 0:
+        log.summary('watch', 'Watching "' + ods_file_name + '" for changes (Ctrl-C to stop)...', file=ods_file_name)
+    else:
+        log.summary('watch', 'Polling "' + ods_file_name + '" for changes (Ctrl-C to stop)...', file=ods_file_name)
+    log.flush()
+    try:
+        while True:
+            watcher.wait()
+            start = time.time()
+            try:
+                generate_show_files(config, ods_file_name, show_name, log=log)
+            except ShowError as e:
+                log.error(e.message, **e.fields())
+                log.error('Show not regenerated, waiting for the next save')
+                continue
+            log.summary('regenerated', 'Regenerated in ' + str(int((time.time() - start) * 1000.0)) + 'ms', ms=int((time.time() - start) * 1000.0))
+            log.flush()
+    except KeyboardInterrupt:
+        log.flush()
+        print('')
+
+def build_batch_show(config_file_name, log_mode):
+
+    # build one show of a batch from its config file, in a pool worker, working in the config file's
+    # directory, so the spreadsheet is found and the files written next to it
+    # anything going wrong is caught, so one bad show doesn't stop the rest
+    # returns (show name, seconds, error or None)
+
+    log = Log(log_mode, LOG_BUFFER_SIZE)
+    start = time.perf_counter()
+    show_name = config_file_name
+    error = None
+    cwd = os.getcwd()
+    try:
+        (config, ods_file_name, show_name) = read_config(config_file_name)
+        config.PARALLEL_RENDER = False      # the shows are already built side by side
+        os.chdir(os.path.dirname(os.path.abspath(config_file_name)))
+        generate_show_files(config, ods_file_name, show_name, parallel=False, log=log)
+    except ShowError as e:
+        log.error(e.message, **e.fields())
+        error = e.message
+    except Exception as e:
+        error = type(e).__name__ + ': ' + str(e)
+    finally:
+        os.chdir(cwd)
+        log.flush()
+    return (show_name, time.perf_counter() - start, error)
+
+def build_batch(config_file_names, log):
+
+    # build every show in the list of config files at once, across a process pool, and report how each went
+    # returns the number of shows that failed
+
+    import concurrent.futures
+
+    # the workers are forked from here on Linux, so importing what a build needs now, rather than where it is
+    # first used, means each worker starts with it already imported (this relies on the fork start method:
+    # where workers are spawned instead, as on macOS and Windows, each one imports everything again anyway)
+    for module_name in [ 'hashlib', 'json', 'zipfile' ]:
+        importlib.import_module(module_name)
+
+    start = time.perf_counter()
+    log.summary('batch_start', 'Building ' + str(len(config_file_names)) + ' shows...', shows=len(config_file_names))
+    log.flush()
+    with concurrent.futures.ProcessPoolExecutor() as pool:
+        futures = [ pool.submit(build_batch_show, config_file_name, log.mode) for config_file_name in config_file_names ]
+        results = [ future.result() for future in futures ]
+
     # report
-    print('Writing cues...')
+    failed = 0
+    for index in range(0, len(results)):
+        (show_name, seconds, error) = results[index]
+        status = 'built'
+        if error is not None:
+            status = 'FAILED: ' + error
+            failed = failed + 1
+        log.summary('batch_show', '    %-20s %8dms  %s' % (show_name, int(seconds * 1000.0), status), config=config_file_names[index], show=show_name, ms=int(seconds * 1000.0), error=error)
+    log.summary('batch', 'Built ' + str(len(results) - failed) + ' of ' + str(len(results)) + ' shows in ' + str(int((time.perf_counter() - start) * 1000.0)) + 'ms',
+        shows=len(results), failed=failed, ms=int((time.perf_counter() - start) * 1000.0))
+    log.flush()
+    return failed
+
+def cue_commands(renderer, cue_index):
+
+    # the commands for one cue, exactly as they appear in its snippet (without the header)
+
+    return renderer.render(cue_index).splitlines()[1:]
+
+def osc_string(s):
+
+    # OSC string: UTF-8, null-terminated, padded to a multiple of 4 bytes
+
+    b = s.encode('utf-8') + b'\0'
+    return b + b'\0' * (-len(b) % 4)
+
+def osc_message(address, args):
+
+    # encode a binary OSC message with int, float and string arguments
+
+    tags = ','
+    data = []
+    for arg in args:
+        if isinstance(arg, int):
+            tags = tags + 'i'
+            data.append(struct.pack('>i', arg))
+        elif isinstance(arg, float):
+            tags = tags + 'f'
+            data.append(struct.pack('>f', arg))
+        else:
+            tags = tags + 's'
+            data.append(osc_string(arg))
+    return osc_string(address) + osc_string(tags) + b''.join(data)
+
+def command_to_osc(command):
+
+    # convert a snippet command line to the equivalent OSC address and arguments
+    # ON/OFF become 1/0 (a send node like /ch/01/mix/13 gets its /on switch), colors become their index
+
+    (address, value) = command.split(' ', 1)
+    if value.startswith('"'):
+        return (address, [ value[1:-1] ])
+    if address.endswith('/color'):
+        return (address, [ X32_COLORS.index(value) ])
+    if value == 'ON' or value == 'OFF':
+        if not address.endswith('/on'):
+            address = address + '/on'
+        if value == 'ON':
+            return (address, [ 1 ])
+        return (address, [ 0 ])
+    return (address, [ int(value) ])
+
+def cue_parameters(renderer, cue_index):
+
+    # the OSC address and arguments of each parameter one cue sets, in snippet order
+
+    return [ command_to_osc(command) for command in cue_commands(renderer, cue_index) ]
+
+def decode_osc_message(data):
+
+    # decode a single binary OSC message (as the console answers queries with) to address and arguments
+
+    strings = []
+    offset = 0
+    for i in range(0, 2):
+        end = data.index(b'\0', offset)
+        strings.append(data[offset:end].decode('utf-8', 'replace'))
+        offset = end + 4 - (end % 4)
+    args = []
+    for tag in strings[1][1:]:
+        if tag == 'i':
+            args.append(struct.unpack_from('>i', data, offset)[0])
+            offset = offset + 4
+        elif tag == 'f':
+            args.append(struct.unpack_from('>f', data, offset)[0])
+            offset = offset + 4
+        elif tag == 's':
+            end = data.index(b'\0', offset)
+            args.append(data[offset:end].decode('utf-8', 'replace'))
+            offset = end + 4 - (end % 4)
+        else:
+            break
+    return (strings[0], args)
+
+def osc_bundle(messages):
+
+    # wrap messages in an OSC bundle to be applied immediately, in order
+
+    elements = [ b'#bundle\0' + struct.pack('>II', 0, 1) ]
+    for message in messages:
+        elements.append(struct.pack('>i', len(message)))
+        elements.append(message)
+    return b''.join(elements)
+
+def pack_bundles(messages, mtu):
+
+    # pack consecutive messages into as few bundles of at most mtu bytes as possible
+    # the messages keep their order, within each bundle and from one bundle to the next, so the
+    # mutes still go before the DCA assignments and the DCA assignments before the unmutes
+    # a message too big to share a bundle is sent on its own
+
+    packets = []
+    bundle = []
+    size = 16
+    for message in messages:
+        if bundle and size + 4 + len(message) > mtu:
+            packets.append(osc_bundle(bundle))
+            bundle = []
+            size = 16
+        if 16 + 4 + len(message) > mtu:
+            packets.append(message)
+            continue
+        bundle.append(message)
+        size = size + 4 + len(message)
+    if bundle:
+        packets.append(osc_bundle(bundle))
+    return packets
+
+def cue_packets(renderer, cue_index, bundles, mtu):
+
+    # the parameters one cue sets, and the finished datagrams for it, ready to hand straight to sendto
+
+    parameters = cue_parameters(renderer, cue_index)
+    messages = [ osc_message(address, args) for (address, args) in parameters ]
+    if bundles:
+        return (parameters, pack_bundles(messages, mtu))
+    return (parameters, messages)
+
+def final_parameters(parameters):
+
+    # the value each parameter is left at after a cue, in the order they are first set
+    # a cue may set a parameter more than once (e.g. a channel muted as a path, then unmuted by OTHER_MUTES),
+    # so only the last value sent is the one the console should end up with
+    # and the console cuts names short, so a longer name from the sheet is expected back cut short too
+
+    final = {}
+    for (address, args) in parameters:
+        if address.endswith('/config/name'):
+            args = [ args[0][:X32_NAME_LENGTH] ]
+        final[address] = args
+    return list(final.items())
+
+def verify_sample(parameters, sample_size):
+
+    # an evenly spread sample of a cue's parameters, always including the last one sent,
+    # which is the one most likely to be lost if the console's buffer overflows
+
+    step = max(1, len(parameters) // sample_size)
+    return parameters[len(parameters) - 1::-step][:sample_size]
+
+class TokenBucket:
+
+    # paces packets to rate per second, letting up to burst go back to back
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.time = time.perf_counter()
+
+    def wait(self):
+
+        # block until a packet may be sent, and take its token
+
+        now = time.perf_counter()
+        self.tokens = min(self.burst, self.tokens + (now - self.time) * self.rate)
+        self.time = now
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 1
+            self.time = time.perf_counter()
+        self.tokens = self.tokens - 1
+
+class LiveShow:
+
+    # fires cues straight at the console over UDP, in place of loading snippets from a USB stick
+    # cues advance from the keyboard or from commands sent to a local UDP control port:
+    #   <Enter> or "go" fires the next cue, "back" (or "b") steps back one cue,
+    #   a cue number stands by that cue, "quit" (or "q") stops
+
+    def __init__(self, config, table, console_ip, console_port=CONSOLE_PORT):
+        import socket
+        self.config = config
+        self.table = table
+        self.console = ( console_ip, console_port )
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.next_cue = 0
+        self.resends = 0
+
+        # older firmware drops bundles without a word, so only use them if a bundled query is answered
+        # and only check cues if the console answers queries at all
+        query = osc_message('/dca/1/config/name', [])
+        self.bundles = self.config.LIVE_BUNDLES and self.console_answers(osc_bundle([ query ]))
+        self.verify = (self.config.LIVE_PACING or self.config.LIVE_VERIFY) and (self.bundles or self.console_answers(query))
+        if self.config.LIVE_BUNDLES and not self.bundles:
+            print('Console did not answer an OSC bundle, sending single messages')
+        if (self.config.LIVE_PACING or self.config.LIVE_VERIFY) and not self.verify:
+            print('Console did not answer a query, sending cues without checking them')
+
+        self.bucket = None
+        if self.config.LIVE_PACING:
+            self.bucket = TokenBucket(self.config.LIVE_INITIAL_RATE, self.config.LIVE_BURST)
+
+        # encode every cue up front, so a GO does nothing but send
+        renderer = SnippetRenderer(config, table)
+        self.cue_packets = [ cue_packets(renderer, cue_index, self.bundles, config.LIVE_MTU) for cue_index in range(0, table.num_cues) ]
+
+        # and the queries to check each one with
+        self.cue_checks = [ self.check_packets(parameters) for (parameters, packets) in self.cue_packets ]
+
+    def check_packets(self, parameters):
+
+        # the parameters to check after a cue (all of them with LIVE_VERIFY, otherwise a sample),
+        # at the values they should end up with, and the queries for them, bundled if the console takes bundles
+
+        checked = final_parameters(parameters)
+        if not self.config.LIVE_VERIFY:
+            checked = verify_sample(checked, self.config.LIVE_VERIFY_SAMPLE)
+        queries = [ osc_message(address, []) for (address, args) in checked ]
+        if self.bundles:
+            queries = pack_bundles(queries, self.config.LIVE_MTU)
+        return (checked, queries)
+
+    def console_answers(self, packet):
+
+        # send a query and see whether the console answers it
+
+        self.drain()
+        self.sock.settimeout(self.config.LIVE_PROBE_TIMEOUT)
+        try:
+            self.sock.sendto(packet, self.console)
+            while True:
+                if self.sock.recv(1024).startswith(osc_string('/dca/1/config/name')):
+                    return True
+        except OSError:
+            return False
+        finally:
+            self.sock.settimeout(None)
+
+    def drain(self):
+
+        # throw away any late answers to earlier queries
+
+        self.sock.setblocking(False)
+        try:
+            while True:
+                self.sock.recv(65536)
+        except OSError:
+            pass
+        finally:
+            self.sock.setblocking(True)
+
+    def send(self, packets):
+        sendto = self.sock.sendto
+        console = self.console
+        if self.bucket is None:
+            for packet in packets:
+                sendto(packet, console)
+        else:
+            wait = self.bucket.wait
+            for packet in packets:
+                wait()
+                sendto(packet, console)
+
+    def query(self, parameters, queries):
+
+        # send all the queries for the parameters at once, rather than one round trip at a time,
+        # matching the answers to them by address as they come back
+        # returns the parameters that came back with a different value or not at all, as
+        # address: (expected arguments, actual arguments or None)
+
+        self.drain()
+        expected = {}
+        for (address, args) in parameters:
+            expected[address] = args
+        actual = {}
+        self.send(queries)
+        deadline = time.perf_counter() + self.config.LIVE_VERIFY_TIMEOUT
+        try:
+            while len(actual) < len(expected):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self.sock.settimeout(remaining)
+                (address, args) = decode_osc_message(self.sock.recv(65536))
+                if address in expected:
+                    actual[address] = args
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.sock.settimeout(None)
+        wrong = {}
+        for address in expected:
+            if actual.get(address) != expected[address]:
+                wrong[address] = (expected[address], actual.get(address))
+        return wrong
+
+    def go(self):
+        if self.next_cue >= self.table.num_cues:
+            print('No more cues')
+            return
+        cue_index = self.next_cue
+        (parameters, packets) = self.cue_packets[cue_index]
+        self.send(packets)
+        print('GO cue "' + self.table.cues[cue_index] + '", label "' + self.table.labels[cue_index] + '" (' + str(len(parameters)) + ' messages in ' + str(len(packets)) + ' packets)')
+
+        # check the cue, and when pacing, back off and send it again if anything went missing,
+        # and speed up a little each time a cue gets through intact
+        if self.verify:
+            start = time.perf_counter()
+            (checked, queries) = self.cue_checks[cue_index]
+            for attempt in range(0, self.config.LIVE_RESENDS + 1):
+                wrong = self.query(checked, queries)
+                if self.bucket is None:
+                    break
+                if len(wrong) == 0:
+                    self.bucket.rate = min(self.config.LIVE_MAX_RATE, self.bucket.rate * 1.25)
+                    break
+                self.bucket.rate = max(self.config.LIVE_MIN_RATE, self.bucket.rate / 2)
+                if attempt == self.config.LIVE_RESENDS:
+                    break
+                print(str(len(wrong)) + ' of ' + str(len(checked)) + ' checked parameters wrong, resending at ' + str(int(self.bucket.rate)) + ' packets/s')
+                self.resends = self.resends + 1
+                self.send(packets)
+            if len(wrong) > 0:
+                print('WARNING: ' + str(len(wrong)) + ' of ' + str(len(checked)) + ' checked parameters wrong after cue "' + self.table.cues[cue_index] + '":')
+                for address in sorted(wrong):
+                    (expected, actual) = wrong[address]
+                    if actual is None:
+                        print('    ' + address + ' did not answer, expected ' + str(expected[0]))
+                    else:
+                        print('    ' + address + ' is ' + str(actual[0]) + ', expected ' + str(expected[0]))
+            elif self.config.LIVE_VERIFY:
+                print('Verified ' + str(len(checked)) + ' parameters in ' + str(int((time.perf_counter() - start) * 1000.0)) + 'ms')
+
+        self.next_cue = cue_index + 1
+        self.report_next()
+
+    def report_next(self):
+        if self.next_cue < self.table.num_cues:
+            print('Next cue "' + self.table.cues[self.next_cue] + '", label "' + self.table.labels[self.next_cue] + '"')
+        else:
+            print('End of show')
+
+    def command(self, command):
+
+        # act on one command, returning False to stop
+
+        command = command.strip()
+        if command == '' or command == 'go':
+            self.go()
+        elif command == 'back' or command == 'b':
+            self.next_cue = max(self.next_cue - 1, 0)
+            self.report_next()
+        elif command == 'quit' or command == 'q':
+            return False
+        elif command in self.table.cues:
+            self.next_cue = self.table.cues.index(command)
+            self.report_next()
+        else:
+            print('Unknown command or cue "' + command + '"')
+        return True
+
+    def forward_stdin(self):
+
+        # pass each line typed on to the control port, as if another program had sent it, in a thread of its
+        # own, so the main loop only ever waits on the one socket (select() can't wait on stdin on Windows)
+        # when stdin is closed, the thread stops, and the control port carries on by itself
+
+        import socket
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for line in sys.stdin:
+            sock.sendto(line.encode('utf-8'), ( '127.0.0.1', self.config.LIVE_CONTROL_PORT ))
+        sock.close()
+
+    def run(self):
+        import socket
+        import threading
+        control = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        control.bind(( '127.0.0.1', self.config.LIVE_CONTROL_PORT ))
+        # wake up now and again, as Ctrl-C doesn't interrupt a socket wait on Windows
+        control.settimeout(0.5)
+        print('Firing cues at ' + self.console[0] + ':' + str(self.console[1]) + ' (<Enter> = GO, b = back, <cue> = standby, q = quit)')
+        print('Control port is 127.0.0.1:' + str(self.config.LIVE_CONTROL_PORT))
+        self.report_next()
+        threading.Thread(target=self.forward_stdin, daemon=True).start()
+        try:
+            running = True
+            while running:
+                try:
+                    command = control.recv(1024).decode('utf-8', 'replace')
+                except socket.timeout:
+                    continue
+                if not self.command(command):
+                    running = False
+        except KeyboardInterrupt:
+            print('')
+        control.close()
+        self.sock.close()
+
+def run_live(config, ods_file_name, console_ip, log):
+
+    # read the show and fire it live
+
+    table = read_show_table(config, ods_file_name, log=log)
+    log.flush()
+    LiveShow(config, table, console_ip).run()
+
+################################################################################
+# Main
+################################################################################    
+        
+def main():
+
+    # run from the command line, either as X32Snippets.py, or by X32Run.py, which starts faster
+
+    options = {}
+    for arg in sys.argv[1:]:
+        if arg.startswith('--'):
+            (name, equals, value) = arg.partition('=')
+            options[name] = value
+    params = [ arg for arg in sys.argv[1:] if not arg.startswith('--') ]
     
-    # write cues
-    cue_index = 0
-    for cue_number in cue_numbers:
-        shw_file.write('cue/' + str(cue_index).zfill(3) + ' ' + cue_number + ' "' + cue_labels[cue_index] + '" 0 -1 ' + str(cue_index) + ' 0 1 0 0\n')
-        cue_index = cue_index + 1
+    # the settings at the top of this file
+    config = Config()
+    if '--verbose' in options:
+        config.LOG_MODE = 'verbose'
+    if '--json' in options:
+        config.LOG_MODE = 'json'
+    log = Log(config.LOG_MODE, config.LOG_BUFFER_SIZE)
     
-    # report
-    print('Writing snippets...')
+    title = '# X32 Snippets v' + VERSION
+    log.summary('start', '#' * len(title) + '\n' + title + '\n' + '#' * len(title), version=VERSION)
+    log.flush()
     
-    # write snippet refs
-    snp_index = 0
-    for cue_number in cue_numbers:
-        shw_file.write('snippet/' + str(snp_index).zfill(3) + ' "' + cue_labels[snp_index] + '" 0 0 0 0 1\n')
-        snp_index = snp_index + 1
+    #
+    # validate command-line parameters
+    #
+    
+    usage = '--verbose' in options and '--json' in options
+    for option in options:
+        if option not in [ '--watch', '--live', '--verify', '--timings', '--profile', '--verbose', '--json', '--batch', '--parallel' ]:
+            usage = True
+    if '--batch' in options:
+        usage = usage or len(params) == 0 or options['--batch'] != '' or '--live' in options or '--watch' in options or '--verify' in options or '--timings' in options or '--profile' in options or '--parallel' in options
+    elif '--live' in options:
+        usage = usage or len(params) != 1 or options['--live'] == '' or '--watch' in options or '--timings' in options or '--profile' in options or '--json' in options or '--parallel' in options
+    else:
+        usage = usage or len(params) != 2 or '--verify' in options or options.get('--profile') == ''
+    
+    if usage:
+        print("");
+        print("Usage: X32Snippets.py [--verbose | --json] [--watch] [--parallel] [--timings] [--profile=<report_file_name>] <ods_file_name> <show_name>")
+        print("       X32Snippets.py [--verbose] --live=<console_ip> [--verify] <ods_file_name>")
+        print("       X32Snippets.py [--verbose | --json] --batch <config_file_name> [<config_file_name> ...]")
+        sys.exit(0)
         
-    # close show file
-    shw_file.close()
+    #
+    # build several shows at once?
+    #
+    
+    if '--batch' in options:
+        if build_batch(params, log) > 0:
+            sys.exit(1)
+        log.summary('done', 'Done!')
+        log.flush()
+        sys.exit(0)
+        
+    #
+    # get command line parameters
+    #
+
+    ods_file_name = params[0]
+    watch = '--watch' in options
+
+    #
+    # fire cues live?
+    #
+    
+    if '--live' in options:
+        if '--verify' in options:
+            config.LIVE_VERIFY = True
+        try:
+            run_live(config, ods_file_name, options['--live'], log)
+        except ShowError as e:
+            log.error(e.message, **e.fields())
+            sys.exit(1)
+        print('Done!')
+        sys.exit(0)
+    
+    #
+    # process file
+    #
+    
+    show_name = params[1]
+    if '--parallel' in options:
+        config.PARALLEL_RENDER = True
+    timings = None
+    profiler = None
+    if '--timings' in options or '--profile' in options:
+        timings = Timings('--profile' in options)
+    if '--profile' in options:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        generate_show_files(config, ods_file_name, show_name, timings, log=log)
+    except ShowError as e:
+        log.error(e.message, **e.fields())
+        if not watch:
+            sys.exit(1)
+        # a sheet that's broken to start with is just one to be fixed and saved, like any other
+        log.error('Show not generated, waiting for the next save')
+    if profiler is not None:
+        profiler.disable()
+        write_profile_report(options['--profile'], profiler, timings)
+        log.summary('profile', 'Wrote profile to ' + options['--profile'], file=options['--profile'])
+    if timings is not None:
+        log.flush()
+        timings.report(log)
+        import tracemalloc
+        tracemalloc.stop()
+    
+    # keep regenerating on every save?
+    if watch:
+        watch_and_regenerate(config, ods_file_name, show_name, log)
     
     # all done
-    print('Done!')
+    log.summary('done', 'Done!')
+    log.flush()
+
+if __name__ == "__main__":
+    main()